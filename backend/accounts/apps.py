@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "accounts"
+
+    def ready(self):
+        from . import schema, signals  # noqa: F401
+        from turbo_back import checks  # noqa: F401
+        from .pruning import start_periodic_pruning
+
+        start_periodic_pruning(
+            settings.ACCOUNTS_TOKEN_PRUNE_INTERVAL, settings.ACCOUNTS_TOKEN_PRUNE_CHUNK_SIZE
+        )
@@ -0,0 +1,144 @@
+"""
+Async variants of the register and login endpoints.
+
+Password hashing runs on the bounded pool from ``accounts.hashing`` rather than
+on the request thread, so a burst of logins queues there (or is turned away
+with ``503``) instead of tying up the workers that serve notes. Bodies other
+than JSON (forms, multipart) are handed to the sync DRF views unchanged.
+Enabled with ``ACCOUNTS_ASYNC_AUTH_VIEWS``, which ``turbo_back.asgi`` switches
+on.
+"""
+
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_login_failed
+from django.contrib.auth.hashers import check_password, make_password
+from django.db import IntegrityError, transaction
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from .hashing import PoolSaturated, get_hashing_pool
+from .serializers import (
+    DUPLICATE_EMAIL_MESSAGE,
+    LoginSerializer,
+    RegisterSerializer,
+    UserSerializer,
+)
+from .views import LoginView, RegisterView, _get_tokens_for_user
+
+User = get_user_model()
+
+_register_view = RegisterView.as_view()
+_login_view = LoginView.as_view()
+
+
+def _parse_body(request):
+    try:
+        return json.loads(request.body or b"{}"), None
+    except ValueError as exc:
+        return None, JsonResponse({"detail": f"JSON parse error - {exc}"}, status=400)
+
+
+def _saturated():
+    response = JsonResponse(
+        {"detail": "Too many authentication requests. Try again shortly."}, status=503
+    )
+    response["Retry-After"] = str(settings.ACCOUNTS_HASHING_POOL["RETRY_AFTER"])
+    return response
+
+
+def _verify_password(user, raw_password):
+    """Check ``raw_password``; returns ``(valid, rehashed)``."""
+    rehashed = []
+
+    def setter(raw_password):
+        user.set_password(raw_password)
+        rehashed.append(True)
+
+    return check_password(raw_password, user.password, setter), bool(rehashed)
+
+
+def _insert_user(email, password):
+    try:
+        with transaction.atomic():
+            return User.objects.create(email=User.objects.normalize_email(email), password=password)
+    except IntegrityError:
+        return None
+
+
+@csrf_exempt
+@require_POST
+async def register(request):
+    if request.content_type != "application/json":
+        return await sync_to_async(_register_view)(request)
+    data, error = _parse_body(request)
+    if error:
+        return error
+    serializer = RegisterSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+
+    try:
+        password = await get_hashing_pool().run(
+            make_password, serializer.validated_data["password"]
+        )
+    except PoolSaturated:
+        return _saturated()
+    user = await sync_to_async(_insert_user)(serializer.validated_data["email"], password)
+    if user is None:
+        return JsonResponse({"email": [DUPLICATE_EMAIL_MESSAGE]}, status=400)
+
+    return JsonResponse(
+        {
+            "user": UserSerializer(user).data,
+            "tokens": await sync_to_async(_get_tokens_for_user)(user),
+        },
+        status=201,
+    )
+
+
+@csrf_exempt
+@require_POST
+async def login(request):
+    if request.content_type != "application/json":
+        return await sync_to_async(_login_view)(request)
+    data, error = _parse_body(request)
+    if error:
+        return error
+    serializer = LoginSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+
+    email, password = serializer.validated_data["email"], serializer.validated_data["password"]
+    try:
+        user = await User.objects.by_email(email).aget()
+    except User.DoesNotExist:
+        user = None
+    try:
+        if user is None:
+            # Hash anyway, so unknown emails take as long as wrong passwords.
+            await get_hashing_pool().run(make_password, password)
+            valid = rehashed = False
+        else:
+            valid, rehashed = await get_hashing_pool().run(_verify_password, user, password)
+    except PoolSaturated:
+        return _saturated()
+    if not valid:
+        # As authenticate() would, for lockout and audit receivers.
+        await user_login_failed.asend(
+            sender="django.contrib.auth", credentials={"email": email}, request=request
+        )
+        return JsonResponse({"detail": "Invalid credentials."}, status=401)
+    if rehashed:
+        await user.asave(update_fields=["password"])
+
+    return JsonResponse(
+        {
+            "user": UserSerializer(user).data,
+            "tokens": await sync_to_async(_get_tokens_for_user)(user),
+        }
+    )
@@ -0,0 +1,97 @@
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser as BaseTokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+_active_cache: dict = {}
+_active_cache_lock = threading.Lock()
+ACTIVE_CACHE_MAX_ENTRIES = 10_000
+
+
+class TokenUser(BaseTokenUser):
+    """Token-backed user whose ``id`` has the same type as ``User.pk``."""
+
+    @cached_property
+    def id(self):
+        return get_user_model()._meta.pk.to_python(self.token[api_settings.USER_ID_CLAIM])
+
+
+def _cached_active(user_id):
+    """Cached answer for ``user_id``: True/False, or None when it must be (re)checked."""
+    if getattr(settings, "ACCOUNTS_ACTIVE_CHECK_TTL", 60) is None:
+        return True
+    cached = _active_cache.get(user_id)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    return None
+
+
+def _remember_active(user_id, active: bool) -> None:
+    expires = time.monotonic() + getattr(settings, "ACCOUNTS_ACTIVE_CHECK_TTL", 60)
+    with _active_cache_lock:
+        if len(_active_cache) >= ACTIVE_CACHE_MAX_ENTRIES:
+            _active_cache.clear()
+        _active_cache[user_id] = (expires, active)
+
+
+def _active_users(user_id):
+    return get_user_model().objects.filter(pk=user_id, is_active=True)
+
+
+def is_user_active(user_id) -> bool:
+    """
+    Return whether the user exists and is active, remembering the answer for
+    ``ACCOUNTS_ACTIVE_CHECK_TTL`` seconds. A TTL of None skips the check.
+    """
+    active = _cached_active(user_id)
+    if active is None:
+        active = _active_users(user_id).exists()
+        _remember_active(user_id, active)
+    return active
+
+
+async def ais_user_active(user_id) -> bool:
+    active = _cached_active(user_id)
+    if active is None:
+        active = await _active_users(user_id).aexists()
+        _remember_active(user_id, active)
+    return active
+
+
+def forget_user(user_id) -> None:
+    _active_cache.pop(user_id, None)
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    JWT authentication that builds ``request.user`` from the token claims
+    instead of loading the ``User`` row on every request.
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        if not is_user_active(user.id):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+    async def aauthenticate(self, request):
+        """``authenticate`` for plain Django async views; checks the user without blocking."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        user = super().get_user(validated_token)
+        if not await ais_user_active(user.id):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user, validated_token
@@ -15,9 +15,15 @@ class EmailBackend(ModelBackend):
         password: str | None = None,
         **kwargs: Any,
     ) -> Any:
+        # The admin login form passes the email as ``username``.
+        email = email or kwargs.get("username")
+        if email is None or password is None:
+            return None
         try:
-            user = User.objects.get(email=email)
+            user = User.objects.by_email(email).get()
         except User.DoesNotExist:
+            # Hash anyway, so unknown emails take as long as wrong passwords.
+            User().set_password(password)
             return None
 
         if user.check_password(password):
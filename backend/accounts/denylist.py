@@ -0,0 +1,245 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.signals import request_finished, setting_changed
+from django.db import DatabaseError
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+logger = logging.getLogger(__name__)
+
+
+class BaseDenylist:
+    """
+    Revoked refresh tokens, keyed by ``jti`` and kept until they would expire
+    anyway. ``may_evict`` stores can drop entries early, so a miss must be
+    confirmed against the ``BlacklistedToken`` table. ``process_local`` stores
+    start empty in every process.
+    """
+
+    may_evict = True
+    process_local = False
+
+    def add(self, jti: str, expires_at: float) -> None:
+        raise NotImplementedError
+
+    def contains(self, jti: str) -> bool:
+        raise NotImplementedError
+
+
+class MemoryDenylist(BaseDenylist):
+    """
+    Process-local LRU store. Only suitable for a single process; entries
+    evicted past ``max_entries`` are looked up in the ``BlacklistedToken`` table again.
+    """
+
+    process_local = True
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, jti: str, expires_at: float) -> None:
+        with self._lock:
+            self._entries[jti] = expires_at
+            self._entries.move_to_end(jti)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def contains(self, jti: str) -> bool:
+        expires_at = self._entries.get(jti)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            with self._lock:
+                self._entries.pop(jti, None)
+            return False
+        return True
+
+
+class CacheDenylist(BaseDenylist):
+    """Stores entries in a Django cache, so a shared backend covers every worker."""
+
+    def __init__(
+        self, alias: str = "token-denylist", key_prefix: str = "token-denylist", may_evict: bool = True
+    ):
+        self.alias = alias
+        self.key_prefix = key_prefix
+        self.may_evict = may_evict
+
+    def _key(self, jti: str) -> str:
+        return f"{self.key_prefix}:{jti}"
+
+    def add(self, jti: str, expires_at: float) -> None:
+        timeout = int(expires_at - time.time()) + 1
+        if timeout > 0:
+            caches[self.alias].set(self._key(jti), 1, timeout)
+
+    def contains(self, jti: str) -> bool:
+        return caches[self.alias].get(self._key(jti)) is not None
+
+
+class TokenAuditLog:
+    """
+    Keeps the ``token_blacklist`` tables filled. Issued and revoked tokens are
+    buffered and written in batches once a response has been sent, keeping
+    INSERTs off the login/refresh hot path; the denylist answers revocation
+    checks in the meantime. Best effort, not durable: a batch is only written
+    after a later response, and rows still buffered when the process exits,
+    or whose write fails, are lost.
+    """
+
+    def __init__(self, batch_size: int = 100, flush_interval: float = 30):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._outstanding: list[dict[str, Any]] = []
+        self._blacklisted: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def _entry(self, token) -> dict[str, Any]:
+        return {
+            "jti": token[api_settings.JTI_CLAIM],
+            "user_id": token.get(api_settings.USER_ID_CLAIM),
+            "token": str(token),
+            "created_at": token.current_time,
+            "expires_at": datetime_from_epoch(token["exp"]),
+        }
+
+    def record_outstanding(self, token) -> None:
+        with self._lock:
+            self._outstanding.append(self._entry(token))
+
+    def record_blacklisted(self, token) -> None:
+        with self._lock:
+            self._blacklisted.append(self._entry(token))
+
+    def pending(self) -> int:
+        return len(self._outstanding) + len(self._blacklisted)
+
+    def maybe_flush(self) -> None:
+        overdue = time.monotonic() - self._last_flush >= self.flush_interval
+        if self.pending() >= self.batch_size or (overdue and self.pending()):
+            self.flush()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._outstanding, self._blacklisted = [], []
+
+    def flush(self) -> None:
+        with self._lock:
+            outstanding, self._outstanding = self._outstanding, []
+            blacklisted, self._blacklisted = self._blacklisted, []
+            self._last_flush = time.monotonic()
+        if not outstanding and not blacklisted:
+            return
+        try:
+            self._write(outstanding + blacklisted, blacklisted)
+        except DatabaseError:
+            logger.exception(
+                "Could not write %d token audit rows", len(outstanding) + len(blacklisted)
+            )
+
+    def _write(self, entries, blacklisted=()) -> None:
+        User = get_user_model()
+        to_pk = User._meta.pk.to_python
+        user_ids = {to_pk(entry["user_id"]) for entry in entries if entry["user_id"]}
+        # A user may be deleted before the batch lands; keep the row without the FK.
+        existing_users = set(User.objects.filter(pk__in=user_ids).values_list("pk", flat=True))
+        rows = []
+        for entry in entries:
+            user_id = to_pk(entry["user_id"]) if entry["user_id"] else None
+            rows.append(
+                OutstandingToken(
+                    jti=entry["jti"],
+                    user_id=user_id if user_id in existing_users else None,
+                    token=entry["token"],
+                    created_at=entry["created_at"],
+                    expires_at=entry["expires_at"],
+                )
+            )
+        OutstandingToken.objects.bulk_create(rows, ignore_conflicts=True)
+        if blacklisted:
+            token_ids = OutstandingToken.objects.filter(
+                jti__in=[entry["jti"] for entry in blacklisted]
+            ).values_list("id", flat=True)
+            BlacklistedToken.objects.bulk_create(
+                [BlacklistedToken(token_id=token_id) for token_id in token_ids],
+                ignore_conflicts=True,
+            )
+
+
+def is_blacklisted(jti: str) -> bool:
+    return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+_denylist: BaseDenylist | None = None
+_audit_log: TokenAuditLog | None = None
+_lock = threading.Lock()
+
+
+def _warm(denylist: BaseDenylist) -> None:
+    """Reload tokens revoked by earlier processes from the ``BlacklistedToken`` table."""
+    try:
+        rows = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now()).values_list(
+            "token__jti", "token__expires_at"
+        )
+        for jti, expires_at in rows.iterator():
+            denylist.add(jti, expires_at.timestamp())
+    except DatabaseError:
+        logger.exception("Could not warm the token denylist from the audit log")
+
+
+def get_denylist() -> BaseDenylist:
+    global _denylist
+    if _denylist is None:
+        with _lock:
+            if _denylist is None:
+                config = settings.ACCOUNTS_TOKEN_DENYLIST
+                denylist = import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+                # Shared stores already hold earlier revocations.
+                if denylist.process_local and config.get("WARM_FROM_AUDIT_LOG", False):
+                    _warm(denylist)
+                _denylist = denylist
+    return _denylist
+
+
+def get_audit_log() -> TokenAuditLog:
+    global _audit_log
+    if _audit_log is None:
+        with _lock:
+            if _audit_log is None:
+                config = settings.ACCOUNTS_TOKEN_AUDIT_LOG
+                _audit_log = TokenAuditLog(
+                    batch_size=config.get("BATCH_SIZE", 100),
+                    flush_interval=config.get("FLUSH_INTERVAL", 30),
+                )
+    return _audit_log
+
+
+@receiver(request_finished)
+def _flush_after_request(**kwargs) -> None:
+    if _audit_log is not None:
+        _audit_log.maybe_flush()
+
+
+@receiver(setting_changed)
+def _reset(setting, **kwargs):
+    global _denylist, _audit_log
+    if setting == "ACCOUNTS_TOKEN_DENYLIST":
+        _denylist = None
+    elif setting == "ACCOUNTS_TOKEN_AUDIT_LOG":
+        if _audit_log is not None:
+            _audit_log.flush()
+        _audit_log = None
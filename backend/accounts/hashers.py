@@ -0,0 +1,60 @@
+"""
+Password hashers whose cost parameters come from ``ACCOUNTS_PASSWORD_HASHING``.
+
+The algorithm names are Django's own, so hashes stay interchangeable with the
+stock hashers. Because ``must_update`` compares a stored hash's parameters with
+the current ones, changing a cost setting re-hashes each password on the user's
+next successful login.
+"""
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+
+def _param(name, default):
+    return getattr(settings, "ACCOUNTS_PASSWORD_HASHING", {}).get(name) or default
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return _param("PBKDF2_ITERATIONS", PBKDF2PasswordHasher.iterations)
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return _param("SCRYPT_WORK_FACTOR", ScryptPasswordHasher.work_factor)
+
+    @property
+    def block_size(self):
+        return _param("SCRYPT_BLOCK_SIZE", ScryptPasswordHasher.block_size)
+
+    @property
+    def parallelism(self):
+        return _param("SCRYPT_PARALLELISM", ScryptPasswordHasher.parallelism)
+
+    @property
+    def maxmem(self):
+        # OpenSSL refuses more than 32 MiB unless told otherwise.
+        return 128 * self.block_size * (self.work_factor + self.parallelism + 2) + 2**20
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Requires ``argon2-cffi``."""
+
+    @property
+    def time_cost(self):
+        return _param("ARGON2_TIME_COST", Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return _param("ARGON2_MEMORY_COST", Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return _param("ARGON2_PARALLELISM", Argon2PasswordHasher.parallelism)
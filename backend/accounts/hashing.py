@@ -0,0 +1,62 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+_lock = threading.Lock()
+_pool = None
+
+
+class PoolSaturated(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+
+
+class HashingPool:
+    """
+    A bounded thread pool for password hashing.
+
+    ``hashlib``'s PBKDF2 and scrypt release the GIL, so hashing on threads
+    uses every core without blocking the event loop. At most ``workers`` hashes
+    run at once and ``queue_size`` more may wait; beyond that ``run`` raises
+    ``PoolSaturated`` instead of queueing without bound.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+
+    async def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PoolSaturated
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # Released when the hash finishes, even if the request was cancelled.
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+def get_hashing_pool() -> HashingPool:
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                config = settings.ACCOUNTS_HASHING_POOL
+                _pool = HashingPool(workers=config["WORKERS"], queue_size=config["QUEUE_SIZE"])
+    return _pool
+
+
+@receiver(setting_changed)
+def _reset(setting, **kwargs):
+    global _pool
+    if setting == "ACCOUNTS_HASHING_POOL" and _pool is not None:
+        _pool.shutdown()
+        _pool = None
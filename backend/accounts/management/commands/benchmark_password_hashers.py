@@ -0,0 +1,45 @@
+import os
+import time
+
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures how many password hashes each configured hasher computes per second "
+        "on one core, to size login worker pools."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seconds", type=float, default=2.0, help="Time spent per hasher.")
+        parser.add_argument(
+            "--algorithm", action="append", help="Only benchmark this algorithm (repeatable)."
+        )
+
+    def handle(self, *args, seconds, algorithm, **options):
+        cores = os.cpu_count() or 1
+        for hasher in get_hashers():
+            if algorithm and hasher.algorithm not in algorithm:
+                continue
+            try:
+                rate = self._hashes_per_second(hasher, seconds)
+            except ValueError as exc:  # Missing optional library.
+                self.stderr.write(f"{hasher.algorithm}: skipped ({exc})")
+                continue
+            self.stdout.write(
+                f"{hasher.algorithm}: {rate:.1f} hashes/s per core "
+                f"({1000 / rate:.1f} ms/hash, ~{rate * cores:.0f} hashes/s on {cores} cores)"
+            )
+
+    def _hashes_per_second(self, hasher, seconds):
+        salt = hasher.salt()
+        hashes = 0
+        started = time.perf_counter()
+        deadline = started + seconds
+        while True:
+            hasher.encode("benchmark-password", salt)
+            hashes += 1
+            now = time.perf_counter()
+            if now >= deadline:
+                return hashes / (now - started)
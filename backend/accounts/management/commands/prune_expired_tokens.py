@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from accounts.pruning import prune_expired_tokens
+
+
+class Command(BaseCommand):
+    help = "Deletes expired outstanding and blacklisted JWT refresh tokens in bounded chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, chunk_size, **options):
+        reclaimed = prune_expired_tokens(chunk_size=chunk_size)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reclaimed {reclaimed['outstanding']} outstanding and "
+                f"{reclaimed['blacklisted']} blacklisted tokens."
+            )
+        )
@@ -1,9 +1,14 @@
 from typing import Any
 
 from django.contrib.auth.models import BaseUserManager
+from django.db.models.functions import Lower
 
 
 class CustomUserManager(BaseUserManager):
+    def by_email(self, email: str) -> Any:
+        """Case-insensitive email lookup, served by the ``users_email_ci_unique`` index."""
+        return self.alias(email_lower=Lower("email")).filter(email_lower=email.lower())
+
     def create_user(self, email: str, password: str | None = None, **extra_fields: Any) -> Any:
         if not email:
             raise ValueError("The Email field must be set")
@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """Index ``token_blacklist_outstandingtoken.expires_at`` for expired-token pruning."""
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+        ("token_blacklist", "0013_alter_blacklistedtoken_options_and_more"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS token_outstanding_expires_at_idx "
+            "ON token_blacklist_outstandingtoken (expires_at)",
+            "DROP INDEX IF EXISTS token_outstanding_expires_at_idx",
+        ),
+    ]
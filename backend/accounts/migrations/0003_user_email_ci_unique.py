@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-17 15:47
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_outstanding_token_expires_at_index"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("email"), name="users_email_ci_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+import logging
+import threading
+from functools import partial
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from turbo_back import periodic
+
+logger = logging.getLogger(__name__)
+
+THREAD_NAME = "token-pruning"
+
+
+def prune_expired_tokens(chunk_size: int = 1000, now=None) -> dict[str, int]:
+    """
+    Delete expired outstanding tokens (and their blacklist entries) in chunks
+    of ``chunk_size``, so no single statement locks the tables for long.
+    Returns the number of rows reclaimed per table.
+    """
+    now = now or timezone.now()
+    reclaimed = {"outstanding": 0, "blacklisted": 0}
+    while True:
+        ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=now)
+            .order_by()
+            .values_list("id", flat=True)[:chunk_size]
+        )
+        if not ids:
+            return reclaimed
+        with transaction.atomic():
+            _, deleted = OutstandingToken.objects.filter(id__in=ids).delete()
+        reclaimed["outstanding"] += deleted.get(OutstandingToken._meta.label, 0)
+        reclaimed["blacklisted"] += deleted.get(BlacklistedToken._meta.label, 0)
+
+
+def _prune_and_log(chunk_size: int) -> None:
+    logger.info("Pruned expired tokens: %s", prune_expired_tokens(chunk_size=chunk_size))
+
+
+def start_periodic_pruning(
+    interval: float | None, chunk_size: int = 1000
+) -> threading.Event | None:
+    """
+    Prune expired tokens every ``interval`` seconds on a daemon thread (None
+    disables it). Returns the running thread's stop event.
+    """
+    return periodic.start(THREAD_NAME, interval, partial(_prune_and_log, chunk_size))
@@ -0,0 +1,5 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class StatelessJWTScheme(SimpleJWTScheme):
+    target_class = "accounts.authentication.StatelessJWTAuthentication"
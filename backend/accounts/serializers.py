@@ -1,9 +1,12 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 
 User = get_user_model()
 
+DUPLICATE_EMAIL_MESSAGE = "A user with this email already exists."
+
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -19,11 +22,6 @@ class RegisterSerializer(serializers.Serializer):
     )
     password_confirm = serializers.CharField(write_only=True, required=True)
 
-    def validate_email(self, value):
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError("A user with this email already exists.")
-        return value
-
     def validate(self, attrs):
         if attrs["password"] != attrs["password_confirm"]:
             raise serializers.ValidationError(
@@ -32,11 +30,16 @@ class RegisterSerializer(serializers.Serializer):
         return attrs
 
     def create(self, validated_data):
-        validated_data.pop("password_confirm")
-        return User.objects.create_user(
-            email=validated_data["email"],
-            password=validated_data["password"],
-        )
+        # Rely on the unique constraint rather than checking first: one insert,
+        # and no race between the check and the insert.
+        try:
+            with transaction.atomic():
+                return User.objects.create_user(
+                    email=validated_data["email"],
+                    password=validated_data["password"],
+                )
+        except IntegrityError:
+            raise serializers.ValidationError({"email": [DUPLICATE_EMAIL_MESSAGE]})
 
 
 class LoginSerializer(serializers.Serializer):
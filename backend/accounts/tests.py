@@ -1,12 +1,48 @@
-from django.contrib.auth import get_user_model
-from django.test import TestCase
+import asyncio
+import json
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.signals import user_login_failed
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.signals import request_finished
+from django.db import connection
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from turbo_back import periodic
+
+from . import async_views
+from .authentication import TokenUser
+from .denylist import CacheDenylist, MemoryDenylist, get_audit_log, get_denylist
+from .hashers import TunedPBKDF2PasswordHasher, TunedScryptPasswordHasher
+from .hashing import get_hashing_pool
+from . import pruning
+from .pruning import prune_expired_tokens, start_periodic_pruning
+from .tokens import RefreshToken as DenylistRefreshToken
+
 User = get_user_model()
 
 
+class AuditLogTestCase(TestCase):
+    """Drops token audit rows a test left buffered, so no later flush writes them."""
+
+    def tearDown(self):
+        get_audit_log().clear()
+
+
 class UserManagerTest(TestCase):
     def test_create_user(self):
         user = User.objects.create_user(email="user@test.com", password="TestPass123!")
@@ -47,7 +83,7 @@ class UserModelTest(TestCase):
         self.assertEqual(User.USERNAME_FIELD, "email")
 
 
-class RegisterViewTest(TestCase):
+class RegisterViewTest(AuditLogTestCase):
     def setUp(self):
         self.client = APIClient()
         self.url = "/api/auth/register/"
@@ -85,6 +121,30 @@ class RegisterViewTest(TestCase):
         }
         response = self.client.post(self.url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("email", response.data)
+
+    def test_register_duplicate_email_differing_case(self):
+        User.objects.create_user(email="existing@test.com", password="TestPass123!")
+        data = {
+            "email": "Existing@Test.com",
+            "password": "StrongPass123!",
+            "password_confirm": "StrongPass123!",
+        }
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_register_single_insert(self):
+        data = {
+            "email": "new@test.com",
+            "password": "StrongPass123!",
+            "password_confirm": "StrongPass123!",
+        }
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.url, data, format="json")
+        statements = [q["sql"] for q in queries if "SAVEPOINT" not in q["sql"]]
+        self.assertEqual(len(statements), 1)
+        self.assertTrue(statements[0].startswith('INSERT INTO "users"'))
 
     def test_register_weak_password(self):
         data = {
@@ -100,7 +160,7 @@ class RegisterViewTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
 
-class LoginViewTest(TestCase):
+class LoginViewTest(AuditLogTestCase):
     def setUp(self):
         self.client = APIClient()
         self.url = "/api/auth/login/"
@@ -114,6 +174,9 @@ class LoginViewTest(TestCase):
         self.assertIn("tokens", response.data)
         self.assertEqual(response.data["user"]["email"], "user@test.com")
 
+    def test_admin_username_login(self):
+        self.assertEqual(authenticate(username="user@test.com", password="TestPass123!"), self.user)
+
     def test_login_wrong_password(self):
         data = {"email": "user@test.com", "password": "WrongPass123!"}
         response = self.client.post(self.url, data, format="json")
@@ -122,15 +185,23 @@ class LoginViewTest(TestCase):
 
     def test_login_nonexistent_user(self):
         data = {"email": "nobody@test.com", "password": "TestPass123!"}
-        response = self.client.post(self.url, data, format="json")
+        with patch.object(User, "set_password") as set_password:
+            response = self.client.post(self.url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        set_password.assert_called_once_with("TestPass123!")
+
+    def test_login_email_is_case_insensitive(self):
+        data = {"email": "User@TEST.com", "password": "TestPass123!"}
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["user"]["email"], "user@test.com")
 
     def test_login_missing_fields(self):
         response = self.client.post(self.url, {}, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
 
-class TokenRefreshViewTest(TestCase):
+class TokenRefreshViewTest(AuditLogTestCase):
     def setUp(self):
         self.client = APIClient()
         self.url = "/api/auth/token/refresh/"
@@ -164,7 +235,7 @@ class TokenRefreshViewTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class LogoutViewTest(TestCase):
+class LogoutViewTest(AuditLogTestCase):
     def setUp(self):
         self.client = APIClient()
         self.url = "/api/auth/logout/"
@@ -193,3 +264,326 @@ class LogoutViewTest(TestCase):
         data = {"refresh": "invalid-token"}
         response = self.client.post(self.url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class StatelessJWTAuthenticationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = "/api/notes/"
+        self.user = User.objects.create_user(email="user@test.com", password="TestPass123!")
+        self.token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def test_token_user_id_matches_pk_type(self):
+        self.assertEqual(TokenUser(self.token).id, self.user.pk)
+
+    @override_settings(NOTES_LIST_CACHE_TIMEOUT=0)
+    def test_user_row_is_not_loaded_per_request(self):
+        self.client.get(self.url)
+        # Only the note ETag and COUNT queries remain once is_active is cached.
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_inactive_user_rejected(self):
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_rejected(self):
+        self.client.get(self.url)
+        self.user.delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_active_check_can_be_disabled(self):
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        with self.settings(ACCOUNTS_ACTIVE_CHECK_TTL=None):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class TokenDenylistTest(AuditLogTestCase):
+    def setUp(self):
+        get_audit_log().clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(email="user@test.com", password="TestPass123!")
+
+    def test_refresh_does_no_writes_or_blacklist_reads(self):
+        refresh = DenylistRefreshToken.for_user(self.user)
+        get_denylist()  # Warm up outside the captured queries.
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/api/auth/token/refresh/", {"refresh": str(refresh)}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        statements = [q["sql"] for q in queries]
+        self.assertEqual([sql for sql in statements if not sql.startswith("SELECT")], [])
+        self.assertFalse([sql for sql in statements if "token_blacklist" in sql])
+        self.assertEqual(get_audit_log().pending(), 3)  # Issued, rotated and revoked rows.
+
+    def test_evicted_denylist_entry_falls_back_to_audit_log(self):
+        denylist = {**settings.ACCOUNTS_TOKEN_DENYLIST, "OPTIONS": {"may_evict": True}}
+        with self.settings(ACCOUNTS_TOKEN_DENYLIST=denylist):
+            refresh = DenylistRefreshToken.for_user(self.user)
+            refresh.blacklist()
+            get_audit_log().flush()
+            caches["token-denylist"].clear()
+            response = self.client.post(
+                "/api/auth/token/refresh/", {"refresh": str(refresh)}, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+            self.assertTrue(get_denylist().contains(refresh["jti"]))
+
+    def test_logged_out_token_cannot_refresh(self):
+        refresh = DenylistRefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        self.client.post("/api/auth/logout/", {"refresh": str(refresh)}, format="json")
+        response = self.client.post(
+            "/api/auth/token/refresh/", {"refresh": str(refresh)}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_rejected_for_inactive_user(self):
+        refresh = DenylistRefreshToken.for_user(self.user)
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.post(
+            "/api/auth/token/refresh/", {"refresh": str(refresh)}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_audit_log_written_in_batches_after_requests(self):
+        before = OutstandingToken.objects.count()
+        with self.settings(ACCOUNTS_TOKEN_AUDIT_LOG={"BATCH_SIZE": 3, "FLUSH_INTERVAL": 3600}):
+            refresh = DenylistRefreshToken.for_user(self.user)
+            refresh.blacklist()
+            request_finished.send(sender=self.__class__)
+            self.assertEqual(get_audit_log().pending(), 2)
+            self.assertEqual(OutstandingToken.objects.count(), before)
+            DenylistRefreshToken.for_user(self.user)
+            self.assertEqual(get_audit_log().pending(), 3)
+            request_finished.send(sender=self.__class__)  # A full batch is written.
+        self.assertEqual(get_audit_log().pending(), 0)
+        self.assertEqual(OutstandingToken.objects.count(), before + 2)
+        self.assertTrue(BlacklistedToken.objects.filter(token__jti=refresh["jti"]).exists())
+
+    def test_denylist_warms_from_audit_log(self):
+        refresh = RefreshToken.for_user(self.user)
+        refresh.blacklist()  # simplejwt's own token writes the row inline.
+        with self.settings(
+            ACCOUNTS_TOKEN_DENYLIST={
+                "BACKEND": "accounts.denylist.MemoryDenylist",
+                "WARM_FROM_AUDIT_LOG": True,
+            }
+        ):
+            self.assertTrue(get_denylist().contains(refresh["jti"]))
+
+    def test_shared_denylist_is_not_warmed(self):
+        RefreshToken.for_user(self.user).blacklist()
+        with self.settings(
+            ACCOUNTS_TOKEN_DENYLIST={
+                "BACKEND": "accounts.denylist.CacheDenylist",
+                "WARM_FROM_AUDIT_LOG": True,
+            }
+        ):
+            with self.assertNumQueries(0):
+                get_denylist()
+
+    def test_memory_denylist_expiry_and_eviction(self):
+        denylist = MemoryDenylist(max_entries=2)
+        denylist.add("expired", time.time() - 1)
+        self.assertFalse(denylist.contains("expired"))
+        denylist.add("a", time.time() + 60)
+        denylist.add("b", time.time() + 60)
+        denylist.add("c", time.time() + 60)
+        self.assertEqual(
+            [denylist.contains(jti) for jti in "abc"], [False, True, True]
+        )
+
+    def test_cache_denylist(self):
+        denylist = CacheDenylist(key_prefix="test-denylist")
+        denylist.add("revoked", time.time() + 60)
+        denylist.add("expired", time.time() - 60)
+        self.assertTrue(denylist.contains("revoked"))
+        self.assertFalse(denylist.contains("expired"))
+        self.assertFalse(denylist.contains("unknown"))
+
+
+class PruneExpiredTokensTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="prune@test.com", password="TestPass123!")
+        now = timezone.now()
+        for i in range(5):
+            token = OutstandingToken.objects.create(
+                user=self.user,
+                jti=f"expired-{i}",
+                token="x",
+                created_at=now - timedelta(days=8),
+                expires_at=now - timedelta(days=1),
+            )
+            if i % 2 == 0:
+                BlacklistedToken.objects.create(token=token)
+        self.live = OutstandingToken.objects.create(
+            user=self.user, jti="live", token="x", created_at=now, expires_at=now + timedelta(days=1)
+        )
+
+    def test_prunes_only_expired_tokens_in_chunks(self):
+        reclaimed = prune_expired_tokens(chunk_size=2)
+        self.assertEqual(reclaimed, {"outstanding": 5, "blacklisted": 3})
+        self.assertEqual(list(OutstandingToken.objects.values_list("jti", flat=True)), ["live"])
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+    def test_periodic_pruning_returns_running_threads_event(self):
+        self.assertIsNone(start_periodic_pruning(interval=None))
+        stop = start_periodic_pruning(interval=3600)
+        try:
+            self.assertIs(start_periodic_pruning(interval=3600), stop)
+        finally:
+            periodic.stop(pruning.THREAD_NAME)
+        self.assertTrue(stop.is_set())
+
+    def test_command_reports_reclaimed_rows(self):
+        out = StringIO()
+        call_command("prune_expired_tokens", "--chunk-size", "10", stdout=out)
+        self.assertIn("Reclaimed 5 outstanding and 3 blacklisted tokens.", out.getvalue())
+
+
+class PasswordHashingTest(AuditLogTestCase):
+    FAST_SCRYPT = {"SCRYPT_WORK_FACTOR": 2**10, "SCRYPT_BLOCK_SIZE": 8, "SCRYPT_PARALLELISM": 1}
+
+    def _login(self):
+        return APIClient().post(
+            "/api/auth/login/",
+            {"email": "hash@test.com", "password": "TestPass123!"},
+            format="json",
+        )
+
+    def test_cost_parameters_come_from_settings(self):
+        with self.settings(ACCOUNTS_PASSWORD_HASHING={"PBKDF2_ITERATIONS": 1000, **self.FAST_SCRYPT}):
+            self.assertEqual(TunedPBKDF2PasswordHasher().iterations, 1000)
+            encoded = TunedScryptPasswordHasher().encode("secret", "somesalt")
+        self.assertTrue(encoded.startswith("scrypt$1024$somesalt$8$1$"))
+
+    def test_login_upgrades_hash_from_legacy_hasher(self):
+        with self.settings(
+            PASSWORD_HASHERS=["accounts.hashers.TunedPBKDF2PasswordHasher"],
+            ACCOUNTS_PASSWORD_HASHING={"PBKDF2_ITERATIONS": 1000},
+        ):
+            user = User.objects.create_user(email="hash@test.com", password="TestPass123!")
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$1000$"))
+
+        with self.settings(ACCOUNTS_PASSWORD_HASHING=self.FAST_SCRYPT):
+            self.assertEqual(self._login().status_code, status.HTTP_200_OK)
+            user.refresh_from_db()
+            self.assertTrue(user.password.startswith("scrypt$1024$"))
+
+            # Raising the cost re-hashes on the next login too.
+            with self.settings(ACCOUNTS_PASSWORD_HASHING={**self.FAST_SCRYPT, "SCRYPT_WORK_FACTOR": 2**11}):
+                self.assertEqual(self._login().status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("scrypt$2048$"))
+
+    def test_benchmark_command_reports_rate(self):
+        out = StringIO()
+        with self.settings(ACCOUNTS_PASSWORD_HASHING=self.FAST_SCRYPT):
+            call_command(
+                "benchmark_password_hashers", "--seconds", "0.05", "--algorithm", "scrypt", stdout=out
+            )
+        self.assertRegex(out.getvalue(), r"^scrypt: [\d.]+ hashes/s per core")
+
+
+class AsyncAuthViewsTest(AuditLogTestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+
+    def _post(self, view, data):
+        request = self.factory.post("/", json.dumps(data), content_type="application/json")
+        return view(request)
+
+    async def test_register_success(self):
+        response = await self._post(
+            async_views.register,
+            {"email": "new@TEST.com", "password": "StrongPass123!", "password_confirm": "StrongPass123!"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        body = json.loads(response.content)
+        self.assertEqual(body["user"]["email"], "new@test.com")
+        self.assertIn("refresh", body["tokens"])
+        user = await User.objects.aget(email="new@test.com")
+        self.assertTrue(await sync_to_async(user.check_password)("StrongPass123!"))
+
+    async def test_register_validation_errors(self):
+        await User.objects.acreate(email="existing@test.com")
+        response = await self._post(
+            async_views.register,
+            {"email": "existing@test.com", "password": "StrongPass123!", "password_confirm": "x"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("password_confirm", json.loads(response.content))
+
+        response = await self._post(
+            async_views.register,
+            {"email": "Existing@test.com", "password": "StrongPass123!", "password_confirm": "StrongPass123!"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("email", json.loads(response.content))
+
+    async def test_login(self):
+        await sync_to_async(User.objects.create_user)(email="user@test.com", password="TestPass123!")
+        response = await self._post(
+            async_views.login, {"email": "user@test.com", "password": "TestPass123!"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("access", json.loads(response.content)["tokens"])
+
+        response = await self._post(
+            async_views.login, {"email": "user@test.com", "password": "WrongPass123!"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = await self._post(
+            async_views.login, {"email": "nobody@test.com", "password": "TestPass123!"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_failed_login_sends_signal(self):
+        failures = []
+
+        def receiver(sender, credentials, request, **kwargs):
+            failures.append(credentials)
+
+        user_login_failed.connect(receiver)
+        try:
+            response = await self._post(
+                async_views.login, {"email": "nobody@test.com", "password": "TestPass123!"}
+            )
+        finally:
+            user_login_failed.disconnect(receiver)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(failures, [{"email": "nobody@test.com"}])
+
+    async def test_form_bodies_are_handed_to_the_sync_views(self):
+        await sync_to_async(User.objects.create_user)(email="user@test.com", password="TestPass123!")
+        request = self.factory.post(
+            "/", {"email": "user@test.com", "password": "TestPass123!"}
+        )  # multipart/form-data
+        response = await async_views.login(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("access", response.data["tokens"])
+
+    async def test_saturated_pool_returns_503(self):
+        release = threading.Event()
+        await User.objects.acreate(email="user@test.com")
+        with self.settings(ACCOUNTS_HASHING_POOL={"WORKERS": 1, "QUEUE_SIZE": 0, "RETRY_AFTER": 2}):
+            busy = asyncio.ensure_future(get_hashing_pool().run(release.wait))
+            await asyncio.sleep(0)
+            try:
+                response = await self._post(
+                    async_views.login, {"email": "user@test.com", "password": "TestPass123!"}
+                )
+            finally:
+                release.set()
+                await busy
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response["Retry-After"], "2")
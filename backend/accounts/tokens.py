@@ -0,0 +1,38 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import BlacklistMixin
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+from .denylist import get_audit_log, get_denylist, is_blacklisted
+
+
+class RefreshToken(BaseRefreshToken):
+    """
+    Refresh token checked against the pluggable denylist, falling back to the
+    ``BlacklistedToken`` table only when the denylist may have evicted the
+    entry. Outstanding and revoked rows go through the batched audit log.
+    """
+
+    def check_blacklist(self) -> None:
+        jti = self.payload[api_settings.JTI_CLAIM]
+        denylist = get_denylist()
+        if denylist.contains(jti):
+            raise TokenError(_("Token is blacklisted"))
+        if denylist.may_evict and is_blacklisted(jti):
+            denylist.add(jti, self.payload["exp"])
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self) -> None:
+        get_denylist().add(self.payload[api_settings.JTI_CLAIM], self.payload["exp"])
+        get_audit_log().record_blacklisted(self)
+
+    def outstand(self) -> None:
+        get_audit_log().record_outstanding(self)
+
+    @classmethod
+    def for_user(cls, user):
+        # Skip BlacklistMixin.for_user, which INSERTs the outstanding row inline.
+        token = super(BlacklistMixin, cls).for_user(user)
+        token.outstand()
+        return token
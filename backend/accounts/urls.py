@@ -1,12 +1,19 @@
+from django.conf import settings
 from django.urls import path
 
+from . import async_views
 from .views import LoginView, LogoutView, RegisterView, TokenRefreshView
 
 app_name = "accounts"
 
+if settings.ACCOUNTS_ASYNC_AUTH_VIEWS:
+    register_view, login_view = async_views.register, async_views.login
+else:
+    register_view, login_view = RegisterView.as_view(), LoginView.as_view()
+
 urlpatterns = [
-    path("register/", RegisterView.as_view(), name="register"),
-    path("login/", LoginView.as_view(), name="login"),
+    path("register/", register_view, name="register"),
+    path("login/", login_view, name="login"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("logout/", LogoutView.as_view(), name="logout"),
 ]
@@ -1,12 +1,12 @@
-from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth import authenticate
 from django.contrib.auth.models import AbstractBaseUser
 from drf_spectacular.utils import extend_schema
 from rest_framework import generics, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.exceptions import TokenError
-from rest_framework_simplejwt.tokens import RefreshToken
 
+from .authentication import TokenUser, is_user_active
 from .serializers import (
     AuthResponseSerializer,
     LoginSerializer,
@@ -16,9 +16,7 @@ from .serializers import (
     TokenRefreshResponseSerializer,
     UserSerializer,
 )
-
-
-User = get_user_model()
+from .tokens import RefreshToken
 
 
 def _get_tokens_for_user(user: AbstractBaseUser) -> dict[str, str]:
@@ -108,9 +106,11 @@ class TokenRefreshView(generics.GenericAPIView):
 
         try:
             old_token = RefreshToken(refresh_token)
+            user = TokenUser(old_token)
+            if not is_user_active(user.id):
+                raise TokenError("User is inactive or deleted.")
             old_token.blacklist()
 
-            user = User.objects.get(id=old_token["user_id"])
             new_refresh = RefreshToken.for_user(user)
 
             return Response(
@@ -0,0 +1,58 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+
+from turbo_back.caches import bump_now_and_on_commit
+
+from .models import Category
+from .representations import represent_categories
+
+VERSION_KEY = "categories:version"
+LIST_KEY = "categories:list:{version}"
+
+
+def get_version() -> float:
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Seed from the clock, so a version lost to eviction never matches a
+        # list cached under an earlier one.
+        cache.add(VERSION_KEY, time.time(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_version() -> None:
+    # The version doubles as the time of the last change, so deletes (which
+    # don't move max(updated_at)) still advance Last-Modified.
+    cache.set(VERSION_KEY, time.time(), None)
+
+
+def invalidate() -> None:
+    bump_now_and_on_commit(bump_version)
+
+
+def get_category_list() -> dict:
+    """
+    Return the serialized category list with its ``etag`` and
+    ``last_modified`` (epoch seconds), rebuilding it only when the version changed.
+    """
+    version = get_version()
+    key = LIST_KEY.format(version=version)
+    entry = cache.get(key)
+    if entry is None:
+        categories = Category.objects.all()
+        data = represent_categories(categories)
+        content = json.dumps(data, sort_keys=True).encode()
+        max_updated = categories.aggregate(max_updated=Max("updated_at"))["max_updated"]
+        last_modified = max(max_updated.timestamp() if max_updated else 0.0, version)
+        entry = {
+            "data": data,
+            "etag": hashlib.md5(content).hexdigest(),
+            "last_modified": int(last_modified),
+        }
+        cache.set(key, entry, getattr(settings, "CATEGORIES_CACHE_TIMEOUT", 300))
+    return entry
@@ -1,10 +1,14 @@
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from rest_framework import status
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from .cache import VERSION_KEY
 from .models import Category
+from .representations import represent_categories
+from .serializers import CategorySerializer
 
 User = get_user_model()
 
@@ -58,3 +62,75 @@ class CategoryListViewTest(TestCase):
         self.client.credentials()
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class CategoryListCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = "/api/categories/"
+        self.user = User.objects.create_user(email="user@test.com", password="TestPass123!")
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        self.work = Category.objects.create(name="Work")
+
+    def test_response_has_validators(self):
+        response = self.client.get(self.url)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", response)
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_cached_list_skips_category_query(self):
+        self.client.get(self.url)
+        # The active-user check is cached too, so nothing reaches the database.
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 1)
+
+    def test_save_invalidates_cache(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.work.name = "Office"
+        self.work.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["name"], "Office")
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_delete_invalidates_cache(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.work.delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+
+    def test_evicted_version_does_not_revive_an_old_list(self):
+        cache.delete(VERSION_KEY)
+        self.client.get(self.url)
+        Category.objects.filter(pk=self.work.pk).update(name="Office")  # No signal.
+        cache.delete(VERSION_KEY)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data[0]["name"], "Office")
+
+
+class CategoryRepresentationTest(TestCase):
+    def setUp(self):
+        Category.objects.create(name="Work")
+        Category.objects.create(name="Home")
+
+    def test_matches_serializer(self):
+        categories = Category.objects.all()
+        self.assertEqual(
+            represent_categories(categories), CategorySerializer(categories, many=True).data
+        )
+
+    @override_settings(TIME_ZONE="America/Lima")
+    def test_matches_serializer_outside_utc(self):
+        categories = Category.objects.all()
+        self.assertEqual(
+            represent_categories(categories), CategorySerializer(categories, many=True).data
+        )
@@ -1,6 +1,10 @@
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
 from drf_spectacular.utils import extend_schema
 from rest_framework import generics, permissions
+from rest_framework.response import Response
 
+from .cache import get_category_list
 from .models import Category
 from .serializers import CategorySerializer
 
@@ -14,7 +18,18 @@ class CategoryListView(generics.ListAPIView):
 
     @extend_schema(
         summary="List categories",
-        description="Returns all available categories (no pagination).",
+        description=(
+            "Returns all available categories (no pagination). Served from a versioned cache "
+            "with `ETag`/`Last-Modified`; conditional requests get a 304 when nothing changed."
+        ),
     )
     def get(self, request, *args, **kwargs):
-        return super().get(request, *args, **kwargs)
+        entry = get_category_list()
+        etag = quote_etag(entry["etag"])
+        response = get_conditional_response(
+            request, etag=etag, last_modified=entry["last_modified"]
+        ) or Response(entry["data"])
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(entry["last_modified"])
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
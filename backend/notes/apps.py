@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class NotesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "notes"
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
+        from .pruning import start_periodic_pruning
+
+        start_periodic_pruning(
+            settings.NOTES_TOMBSTONE_PRUNE_INTERVAL, settings.NOTES_TOMBSTONE_PRUNE_CHUNK_SIZE
+        )
@@ -0,0 +1,271 @@
+"""
+Async implementations of the core note endpoints, for ASGI workers.
+
+They serve the same URLs and payloads as ``NoteViewSet`` for list, retrieve,
+create, partial update and delete, using the async ORM and non-blocking token
+authentication, so one worker can hold many slow clients at once. Requests
+they do not handle natively (search, sparse fieldsets, cursor pages,
+non-JSON bodies, ``HEAD``/``OPTIONS``...) are handed to ``NoteViewSet``
+unchanged. Enabled with ``NOTES_ASYNC_VIEWS``, which ``turbo_back.asgi``
+switches on.
+"""
+
+import asyncio
+import io
+import math
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from accounts.authentication import StatelessJWTAuthentication
+from categories.models import Category
+
+from . import cache as page_cache
+from .etags import anotes_list_etag, note_etag, precondition_failed
+from .events import get_broker
+from .exceptions import EventStreamUnavailable, PreconditionFailed
+from .filters import NoteFilter
+from .models import Note
+from .representations import note_rows, represent_note, represent_notes
+from .serializers import NoteBulkCreateSerializer
+from .views import NoteViewSet
+
+NATIVE_LIST_PARAMS = {"page", "category", "updated_after"}
+
+_list_view = NoteViewSet.as_view({"get": "list", "post": "create"})
+_detail_view = NoteViewSet.as_view(
+    {"get": "retrieve", "patch": "partial_update", "delete": "destroy"}
+)
+
+
+def _render(data, status_code=status.HTTP_200_OK, headers=None):
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    return HttpResponse(
+        renderer.render(data),
+        status=status_code,
+        content_type=renderer.media_type,
+        headers=headers,
+    )
+
+
+def _error(exc):
+    """Render ``exc`` the way DRF's default exception handler does."""
+    detail = exc.detail if isinstance(exc.detail, (dict, list)) else {"detail": exc.detail}
+    headers = None
+    if isinstance(exc, (exceptions.AuthenticationFailed, exceptions.NotAuthenticated)):
+        headers = {"WWW-Authenticate": StatelessJWTAuthentication().authenticate_header(None)}
+    return _render(detail, exc.status_code, headers)
+
+
+async def _authenticate(request):
+    result = await StatelessJWTAuthentication().aauthenticate(request)
+    if result is None:
+        raise exceptions.NotAuthenticated()
+    return result[0]
+
+
+def _parse(request):
+    if not request.body:
+        return {}
+    return api_settings.DEFAULT_PARSER_CLASSES[0]().parse(io.BytesIO(request.body))
+
+
+async def _validated(request, partial=False):
+    """Validate a write payload, resolving ``category_id`` with one async query."""
+    serializer = NoteBulkCreateSerializer(data=_parse(request), partial=partial)
+    serializer.is_valid(raise_exception=True)
+    data = dict(serializer.validated_data)
+    if "category_id" in data:
+        category_id = data.pop("category_id")
+        data["category"] = await Category.objects.filter(pk=category_id).afirst()
+        if data["category"] is None:
+            raise exceptions.ValidationError(
+                {"category_id": [f'Invalid pk "{category_id}" - object does not exist.']}
+            )
+    return data
+
+
+async def _get_note(request, user, pk):
+    note = await (
+        Note.objects.select_related("category").filter(user_id=user.id, pk=pk).afirst()
+    )
+    if note is None:
+        raise exceptions.NotFound("No Note matches the given query.")
+    if request.method in ("PATCH", "DELETE"):
+        if precondition_failed(request, note_etag(note)):
+            raise PreconditionFailed()
+    return note
+
+
+def _handles_natively(request, methods, params=frozenset()):
+    if request.method not in methods or not set(request.GET) <= params:
+        return False
+    if request.method in ("POST", "PATCH"):
+        return request.content_type == "application/json"
+    return True
+
+
+async def _list(request, user):
+    filterset = NoteFilter(request.GET, queryset=Note.objects.filter(user_id=user.id))
+    if not filterset.is_valid():
+        raise exceptions.ValidationError(filterset.errors)
+    queryset = filterset.qs
+
+    cache_key = None
+    if page_cache.get_timeout():
+        # Shares NoteViewSet.list's entries: both key pages by their full URL.
+        cache_key = page_cache.page_key(user.id, request.build_absolute_uri())
+        cached = page_cache.get_page(cache_key)
+        if cached is not None:
+            response = get_conditional_response(request, etag=cached["etag"])
+            if response is None:
+                response = _render(cached["data"])
+            response["ETag"] = cached["etag"]
+            return response
+
+    etag = await anotes_list_etag(queryset)
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        return response
+
+    page_size = api_settings.PAGE_SIZE
+    count = await queryset.acount()
+    num_pages = max(1, math.ceil(count / page_size))
+    raw_page = request.GET.get("page") or 1
+    try:
+        page = num_pages if raw_page == "last" else int(raw_page)
+    except ValueError:
+        page = 0
+    if not 1 <= page <= num_pages:
+        raise exceptions.NotFound("Invalid page.")
+
+    offset = (page - 1) * page_size
+    rows = [row async for row in note_rows(queryset)[offset : offset + page_size]]
+    url = request.build_absolute_uri()
+    previous = None
+    if page == 2:
+        previous = remove_query_param(url, "page")
+    elif page > 2:
+        previous = replace_query_param(url, "page", page - 1)
+    data = {
+        "count": count,
+        "next": replace_query_param(url, "page", page + 1) if page < num_pages else None,
+        "previous": previous,
+        "results": represent_notes(rows),
+    }
+    if cache_key is not None:
+        page_cache.set_page(cache_key, data, etag)
+    return _render(data, headers={"ETag": etag})
+
+
+async def _create(request, user):
+    data = await _validated(request)
+    note = await Note.objects.acreate(user_id=user.id, **data)
+    return _render(represent_note(note), status.HTTP_201_CREATED)
+
+
+async def _retrieve(request, user, pk):
+    note = await _get_note(request, user, pk)
+    etag = note_etag(note)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = _render(represent_note(note))
+    response["ETag"] = etag
+    return response
+
+
+async def _update(request, user, pk):
+    note = await _get_note(request, user, pk)
+    data = await _validated(request, partial=True)
+    for field, value in data.items():
+        setattr(note, field, value)
+    await note.asave(update_fields=[*data, "updated_at"])
+    return _render(represent_note(note), headers={"ETag": note_etag(note)})
+
+
+async def _destroy(request, user, pk):
+    note = await _get_note(request, user, pk)
+    # The tombstone is written by the post_delete receiver, in the delete's transaction.
+    await note.adelete()
+    return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+
+
+@csrf_exempt
+async def note_list(request):
+    native = _handles_natively(request, ("GET", "POST"), NATIVE_LIST_PARAMS)
+    if not native or getattr(settings, "NOTES_PAGINATION", "page") != "page":
+        return await sync_to_async(_list_view)(request)
+    try:
+        user = await _authenticate(request)
+        if request.method == "GET":
+            return await _list(request, user)
+        return await _create(request, user)
+    except exceptions.APIException as exc:
+        return _error(exc)
+
+
+@csrf_exempt
+async def note_detail(request, pk):
+    if not _handles_natively(request, ("GET", "PATCH", "DELETE")):
+        return await sync_to_async(_detail_view)(request, pk=pk)
+    handler = {"GET": _retrieve, "PATCH": _update, "DELETE": _destroy}[request.method]
+    try:
+        return await handler(request, await _authenticate(request), pk)
+    except exceptions.APIException as exc:
+        return _error(exc)
+
+
+async def _event_stream(subscription, keepalive):
+    try:
+        yield f"retry: {settings.NOTES_EVENTS.get('RETRY', 3000)}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), keepalive)
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event is None:
+                return
+            yield event.encode()
+    finally:
+        subscription.close()
+
+
+async def note_events(request):
+    """
+    Server-Sent Events stream of the user's note changes (``note.created``,
+    ``note.updated``, ``note.deleted``, each with the note ``id``). Resumes after
+    ``Last-Event-ID`` (or ``?last_event_id=``); a ``reset`` event means the gap
+    can no longer be replayed and the client should resync. Only routed when
+    ``NOTES_ASYNC_VIEWS`` is on; a WSGI worker would block on the stream, so it
+    answers 501 there.
+    """
+    if isinstance(request, WSGIRequest):
+        return _error(EventStreamUnavailable())
+    if request.method != "GET":
+        return _error(exceptions.MethodNotAllowed(request.method))
+    try:
+        user = await _authenticate(request)
+    except exceptions.APIException as exc:
+        return _error(exc)
+    last_event_id = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return _error(exceptions.ValidationError({"last_event_id": ["A valid integer is required."]}))
+
+    subscription = get_broker().subscribe(user.id, last_event_id)
+    response = StreamingHttpResponse(
+        _event_stream(subscription, settings.NOTES_EVENTS.get("KEEPALIVE", 15)),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,116 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from categories.models import Category
+
+from .models import Note
+from .serializers import NoteBulkCreateSerializer, NoteBulkUpdateSerializer
+from .signals import notes_bulk_changed
+
+UPDATE_FIELDS = ["title", "content", "category", "updated_at"]
+
+
+def _check_batch(items):
+    if not isinstance(items, list):
+        raise ValidationError({"detail": "Expected a list of notes."})
+    limit = getattr(settings, "NOTES_BULK_MAX_ITEMS", 500)
+    if len(items) > limit:
+        raise ValidationError({"detail": f"A batch may contain at most {limit} notes."})
+
+
+def _validate(serializer_class, items, errors, **kwargs):
+    valid = {}
+    for index, item in enumerate(items):
+        serializer = serializer_class(data=item, **kwargs)
+        if serializer.is_valid():
+            valid[index] = serializer.validated_data
+        else:
+            errors.append({"index": index, "errors": serializer.errors})
+    return valid
+
+
+def _resolve_categories(valid, errors):
+    """Swap ``category_id`` for ``Category`` objects using a single ``IN`` query."""
+    ids = {data["category_id"] for data in valid.values() if "category_id" in data}
+    categories = Category.objects.in_bulk(ids)
+    for index, data in list(valid.items()):
+        if "category_id" not in data:
+            continue
+        category = categories.get(data.pop("category_id"))
+        if category is None:
+            errors.append({"index": index, "errors": {"category_id": ["Invalid category."]}})
+            del valid[index]
+        else:
+            data["category"] = category
+
+
+def bulk_create_notes(user_id, items):
+    """Create every valid item in one transaction. Returns ``(notes, errors)``."""
+    _check_batch(items)
+    errors = []
+    valid = _validate(NoteBulkCreateSerializer, items, errors)
+    _resolve_categories(valid, errors)
+
+    notes = [Note(user_id=user_id, **data) for data in valid.values()]
+    with transaction.atomic():
+        notes = Note.objects.bulk_create(notes)
+        notes_bulk_changed.send(
+            sender=Note, user_id=user_id, action="created", note_ids=[note.pk for note in notes]
+        )
+    return notes, sorted(errors, key=lambda error: error["index"])
+
+
+def bulk_update_notes(user_id, items):
+    """Apply partial updates to the user's notes in one transaction. Returns ``(notes, errors)``."""
+    _check_batch(items)
+    errors = []
+    valid = _validate(NoteBulkUpdateSerializer, items, errors, partial=True)
+    for index, data in list(valid.items()):
+        if "id" not in data:
+            errors.append({"index": index, "errors": {"id": ["This field is required."]}})
+            del valid[index]
+    _resolve_categories(valid, errors)
+
+    ids = [data["id"] for data in valid.values()]
+    notes = Note.objects.filter(user_id=user_id).select_related("category").in_bulk(ids)
+    now = timezone.now()
+    updated, seen = [], set()
+    for index, data in valid.items():
+        note = notes.get(data["id"])
+        if note is None:
+            errors.append({"index": index, "errors": {"id": ["Not found."]}})
+            continue
+        if note.pk in seen:
+            errors.append({"index": index, "errors": {"id": ["Duplicate note in batch."]}})
+            continue
+        seen.add(note.pk)
+        for field, value in data.items():
+            setattr(note, field, value)
+        # bulk_update() skips auto_now, so stamp it explicitly.
+        note.updated_at = now
+        updated.append(note)
+
+    with transaction.atomic():
+        Note.objects.bulk_update(updated, UPDATE_FIELDS)
+        notes_bulk_changed.send(
+            sender=Note, user_id=user_id, action="updated", note_ids=[note.pk for note in updated]
+        )
+    return updated, sorted(errors, key=lambda error: error["index"])
+
+
+def bulk_delete_notes(user_id, ids):
+    """Delete the user's notes. Returns ``(deleted_ids, errors)``."""
+    _check_batch(ids)
+    existing = set(Note.objects.filter(user_id=user_id, id__in=ids).values_list("id", flat=True))
+    errors = [
+        {"index": index, "errors": {"id": ["Not found."]}}
+        for index, note_id in enumerate(ids)
+        if note_id not in existing
+    ]
+    deleted = sorted(existing)
+    # Not a fast delete: post_delete fires per note, recording its tombstone and
+    # publishing the change event.
+    Note.objects.filter(user_id=user_id, id__in=deleted).delete()
+    return deleted, errors
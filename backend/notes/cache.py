@@ -0,0 +1,66 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from categories import cache as categories_cache
+from turbo_back.caches import bump_now_and_on_commit
+
+GENERATION_KEY = "notes:generation:{user_id}"
+PAGE_KEY = "notes:page:{user_id}:{generation}:{categories_version}:{url}"
+
+
+def get_timeout():
+    """Seconds a cached list page lives; 0 or None disables the page cache."""
+    return getattr(settings, "NOTES_LIST_CACHE_TIMEOUT", 0)
+
+
+def _initial_generation() -> int:
+    # Start from the clock, so a counter lost to eviction never reuses a
+    # generation that older cached pages were stored under.
+    return time.time_ns()
+
+
+def get_generation(user_id) -> int:
+    key = GENERATION_KEY.format(user_id=user_id)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, _initial_generation(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(user_id) -> None:
+    key = GENERATION_KEY.format(user_id=user_id)
+    try:
+        cache.incr(key)
+    except ValueError:  # Not cached yet, or evicted.
+        cache.add(key, _initial_generation(), None)
+
+
+def invalidate(user_id) -> None:
+    """Retire every cached list page of the user in O(1)."""
+    bump_now_and_on_commit(lambda: bump_generation(user_id))
+
+
+def page_key(user_id, url: str) -> str:
+    """Cache key of one list page: its full URL under the user's current generation."""
+    return PAGE_KEY.format(
+        user_id=user_id,
+        generation=get_generation(user_id),
+        # Pages embed category names, so category edits retire them too.
+        categories_version=categories_cache.get_version(),
+        url=hashlib.md5(url.encode()).hexdigest(),
+    )
+
+
+def get_page(key):
+    """Return the cached ``{"data", "etag"}`` entry of a page, or None."""
+    return cache.get(key)
+
+
+def set_page(key, data, etag) -> None:
+    # Store plain containers: DRF's ReturnList keeps a reference to its serializer.
+    data = {name: list(value) if isinstance(value, list) else value for name, value in data.items()}
+    cache.set(key, {"data": data, "etag": etag}, get_timeout())
@@ -0,0 +1,63 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.checks import Error, Tags, register
+from django.db import connections
+
+from .models import Note
+
+SQLITE_TABLE_SCAN = re.compile(r"\bSCAN (\w+)$")
+SQLITE_SORT = "USE TEMP B-TREE"
+POSTGRES_TABLE_SCAN = re.compile(r"Seq Scan on (\w+)")
+POSTGRES_SORT = re.compile(r"->\s+Sort\b|^Sort\b")
+
+
+def _hot_querysets():
+    from .views import NoteViewSet
+
+    note_view = NoteViewSet()
+    note_view.request = type("Request", (), {"user": get_user_model()(pk=0)})()
+    # Only the per-user (and per-category) note queries: the small, unfiltered
+    # categories table is expected to be scanned, by itself or in a join.
+    notes = note_view.get_queryset()
+    return [
+        ("NoteViewSet list", notes),
+        ("NoteViewSet cursor page", notes.order_by("-created_at", "-id")),
+        ("NoteViewSet category filter", notes.filter(category_id=0)),
+    ]
+
+
+def _plan_problems(vendor, plan, table=None):
+    """Yield the scans of ``table`` (the notes table by default) and the sorts in ``plan``."""
+    table = table or Note._meta.db_table
+    for line in plan.splitlines():
+        line = line.strip()
+        if vendor == "sqlite":
+            if (match := SQLITE_TABLE_SCAN.search(line)) and match.group(1) == table:
+                yield f"full table scan on {table}"
+            elif SQLITE_SORT in line:
+                yield "sort through a temporary B-tree"
+        elif vendor == "postgresql":
+            if (match := POSTGRES_TABLE_SCAN.search(line)) and match.group(1) == table:
+                yield f"sequential scan on {table}"
+            elif POSTGRES_SORT.search(line):
+                yield "explicit sort step"
+
+
+@register(Tags.database, deploy=True)
+def check_hot_query_plans(app_configs=None, databases=None, **kwargs):
+    """Run EXPLAIN on the hot API queries (``manage.py check --deploy --database default``)."""
+    errors = []
+    for alias in databases or []:
+        vendor = connections[alias].vendor
+        for label, queryset in _hot_querysets():
+            plan = queryset.using(alias).explain()
+            for problem in _plan_problems(vendor, plan):
+                errors.append(
+                    Error(
+                        f"{label} query plan uses a {problem} on database '{alias}'.",
+                        hint=f"Add or fix an index for this query. Plan:\n{plan}",
+                        id="notes.E001",
+                    )
+                )
+    return errors
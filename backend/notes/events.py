@@ -0,0 +1,188 @@
+"""
+In-process pub/sub of note changes, feeding the ``/api/notes/events/`` stream.
+
+Changes are published per user once their transaction commits. The broker is
+chosen with ``NOTES_EVENTS["BACKEND"]``; ``MemoryBroker`` keeps subscribers
+and a short replay history in the current process, so it only sees changes
+made by the same worker.
+"""
+
+import asyncio
+import itertools
+import json
+import threading
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+_lock = threading.Lock()
+_broker = None
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    type: str
+    data: dict
+
+    def encode(self) -> str:
+        return f"id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.data)}\n\n"
+
+
+class BaseBroker:
+    def publish(self, user_id, action: str, note_ids) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, user_id, last_event_id: int | None = None):
+        """Return a subscription whose ``await get()`` yields events (``None`` ends the stream)."""
+        raise NotImplementedError
+
+
+class MemorySubscription:
+    def __init__(self, broker, user_id, backlog, queue_size):
+        self._broker = broker
+        self._user_id = user_id
+        self._backlog = deque(backlog)
+        self._queue = asyncio.Queue(maxsize=queue_size)
+        self._loop = asyncio.get_running_loop()
+
+    def deliver(self, event: Event) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:  # Loop already closed.
+            self.close()
+
+    def _put(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow to keep up: end the stream; the client resumes from history.
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(None)
+
+    async def get(self) -> Event | None:
+        if self._backlog:
+            return self._backlog.popleft()
+        return await self._queue.get()
+
+    def close(self) -> None:
+        self._broker._unsubscribe(self._user_id, self)
+
+
+class _UserHistory:
+    def __init__(self, floor: int, size: int):
+        # Last event ID issued when the broker started tracking the user.
+        self.floor = floor
+        self.events = deque(maxlen=size)
+        self.evicted = 0
+
+
+class MemoryBroker(BaseBroker):
+    """
+    Process-local broker. Keeps the last ``history_size`` events of each of the
+    ``max_users`` most recently active users for ``Last-Event-ID`` resume. A
+    resume it cannot replay gets a ``reset`` event instead: one whose events
+    were evicted, or an ID this broker never issued for the user (from before
+    a restart, from another worker, or before the user was last dropped).
+    """
+
+    def __init__(self, history_size: int = 100, queue_size: int = 1000, max_users: int = 10_000):
+        self.history_size = history_size
+        self.queue_size = queue_size
+        self.max_users = max_users
+        self._ids = itertools.count(1)
+        self._last_id = 0
+        self._lock = threading.Lock()
+        self._users: OrderedDict[object, _UserHistory] = OrderedDict()
+        self._subscribers = defaultdict(set)
+
+    def _user(self, user_id) -> _UserHistory:
+        """Return the user's history, marking it most recently used (call with the lock held)."""
+        history = self._users.get(user_id)
+        if history is None:
+            history = self._users[user_id] = _UserHistory(self._last_id, self.history_size)
+            excess = len(self._users) - self.max_users
+            if excess > 0:
+                # Drop the least recently active users nobody is streaming to.
+                idle = (other for other in self._users if other not in self._subscribers)
+                for stale_id in list(itertools.islice(idle, excess)):
+                    del self._users[stale_id]
+        else:
+            self._users.move_to_end(user_id)
+        return history
+
+    def publish(self, user_id, action, note_ids):
+        with self._lock:
+            history = self._user(user_id)
+            events = [
+                Event(next(self._ids), f"note.{action}", {"id": note_id}) for note_id in note_ids
+            ]
+            if events:
+                self._last_id = events[-1].id
+            for event in events:
+                if len(history.events) == history.events.maxlen:
+                    history.evicted = history.events[0].id
+                history.events.append(event)
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscription in subscribers:
+            for event in events:
+                subscription.deliver(event)
+
+    def subscribe(self, user_id, last_event_id=None):
+        with self._lock:
+            history = self._user(user_id)
+            backlog = []
+            if last_event_id is not None:
+                known = history.floor <= last_event_id <= self._last_id
+                if not known or history.evicted > last_event_id:
+                    # Resuming after the reset's own ID picks up from now.
+                    backlog.append(Event(self._last_id, "reset", {}))
+                else:
+                    backlog.extend(event for event in history.events if event.id > last_event_id)
+            subscription = MemorySubscription(self, user_id, backlog, self.queue_size)
+            self._subscribers[user_id].add(subscription)
+        return subscription
+
+    def _unsubscribe(self, user_id, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[user_id]
+
+
+def get_broker() -> BaseBroker:
+    global _broker
+    if _broker is None:
+        with _lock:
+            if _broker is None:
+                config = settings.NOTES_EVENTS
+                _broker = import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+    return _broker
+
+
+def publish_on_commit(user_id, action: str, note_ids) -> None:
+    """
+    Publish once the current transaction commits, so rolled-back changes never
+    leak. Nothing is published when the stream is not served (``NOTES_ASYNC_VIEWS``
+    off), since no one could subscribe.
+    """
+    if not settings.NOTES_ASYNC_VIEWS:
+        return
+    note_ids = list(note_ids)
+    if note_ids:
+        transaction.on_commit(lambda: get_broker().publish(user_id, action, note_ids))
+
+
+@receiver(setting_changed)
+def _reset(setting, **kwargs):
+    global _broker
+    if setting == "NOTES_EVENTS":
+        _broker = None
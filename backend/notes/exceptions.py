@@ -0,0 +1,14 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "The note has been modified since it was fetched."
+    default_code = "precondition_failed"
+
+
+class EventStreamUnavailable(APIException):
+    status_code = status.HTTP_501_NOT_IMPLEMENTED
+    default_detail = "Event streams are only served by ASGI workers."
+    default_code = "event_stream_unavailable"
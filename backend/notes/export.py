@@ -0,0 +1,75 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+EXPORT_FIELDS = ["id", "title", "content", "category_id", "category__name", "created_at", "updated_at"]
+EXPORT_COLUMNS = ["id", "title", "content", "category_id", "category", "created_at", "updated_at"]
+FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+}
+
+
+def _ordered_rows(queryset):
+    # values() rather than values_list(): the latter's aiterator() runs its
+    # query on the event loop thread.
+    return queryset.order_by("-created_at", "-id").values(*EXPORT_FIELDS)
+
+
+def export_rows(queryset, chunk_size: int):
+    """Yield each note as a plain dict, fetching ``chunk_size`` rows at a time."""
+    for row in _ordered_rows(queryset).iterator(chunk_size=chunk_size):
+        yield dict(zip(EXPORT_COLUMNS, row.values()))
+
+
+async def aexport_rows(queryset, chunk_size: int):
+    async for row in _ordered_rows(queryset).aiterator(chunk_size=chunk_size):
+        yield dict(zip(EXPORT_COLUMNS, row.values()))
+
+
+def ndjson_writer():
+    """Return the header line (None) and a function rendering one row as a line."""
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    return None, lambda row: encoder.encode(row) + "\n"
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the line instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def csv_writer():
+    writer = csv.writer(_Echo())
+
+    def render(row):
+        return writer.writerow(
+            [value.isoformat() if hasattr(value, "isoformat") else value for value in row.values()]
+        )
+
+    return writer.writerow(EXPORT_COLUMNS), render
+
+
+WRITERS = {"ndjson": ndjson_writer, "csv": csv_writer}
+
+
+def stream_export(queryset, output: str, chunk_size: int):
+    header, render = WRITERS[output]()
+    if header is not None:
+        yield header
+    for row in export_rows(queryset, chunk_size):
+        yield render(row)
+
+
+async def astream_export(queryset, output: str, chunk_size: int):
+    """
+    ``stream_export`` for ASGI. Django reads a sync iterator whole (through
+    ``sync_to_async``) before sending an async response, so ASGI needs this one
+    to keep memory flat.
+    """
+    header, render = WRITERS[output]()
+    if header is not None:
+        yield header
+    async for row in aexport_rows(queryset, chunk_size):
+        yield render(row)
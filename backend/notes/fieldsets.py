@@ -0,0 +1,49 @@
+from django.db.models.functions import Substr
+from rest_framework.exceptions import ValidationError
+
+READABLE_FIELDS = ["id", "title", "content", "category", "created_at", "updated_at"]
+TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+def _split(value):
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def parse_fieldset(query_params):
+    """
+    Resolve ``?fields=`` / ``?omit=`` into the list of fields to render, or
+    None when the client wants the full representation.
+    """
+    fields = _split(query_params.get("fields", ""))
+    omit = _split(query_params.get("omit", ""))
+    if not fields and not omit:
+        return None
+
+    unknown = sorted(set(fields + omit) - set(READABLE_FIELDS))
+    if unknown:
+        raise ValidationError({"fields": f"Unknown field(s): {', '.join(unknown)}."})
+    selected = [name for name in READABLE_FIELDS if not fields or name in fields]
+    return [name for name in selected if name not in omit]
+
+
+def parse_preview(query_params):
+    return query_params.get("preview", "").lower() in TRUE_VALUES
+
+
+def apply_fieldset(queryset, fields, preview, preview_length):
+    """
+    Load only the columns needed to render ``fields``. In preview mode the
+    content is truncated in SQL, so full note bodies never leave the database.
+    """
+    fields = READABLE_FIELDS if fields is None else fields
+    # id and created_at back the ordering and keyset cursors, and updated_at the
+    # page ETag, so always load them.
+    columns = {"id", "created_at", "updated_at"} | {name for name in fields if name != "category"}
+    if "content" in columns and preview:
+        columns.remove("content")
+        queryset = queryset.annotate(content_preview=Substr("content", 1, preview_length))
+    if "category" in fields:
+        columns.add("category")
+    else:
+        queryset = queryset.select_related(None)
+    return queryset.only(*columns)
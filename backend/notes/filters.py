@@ -0,0 +1,12 @@
+import django_filters
+
+from .models import Note
+
+
+class NoteFilter(django_filters.FilterSet):
+    category = django_filters.NumberFilter(field_name="category_id")
+    updated_after = django_filters.IsoDateTimeFilter(field_name="updated_at", lookup_expr="gt")
+
+    class Meta:
+        model = Note
+        fields = ["category", "updated_after"]
@@ -0,0 +1,135 @@
+import csv
+import json
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from categories.models import Category
+
+from .models import Note
+from .serializers import NoteBulkCreateSerializer
+from .signals import notes_bulk_changed
+
+INPUT_FORMATS = ("ndjson", "csv")
+
+
+class CategoryResolver:
+    """Resolves category names (case-insensitively) or IDs from one up-front query."""
+
+    def __init__(self):
+        rows = Category.objects.values_list("id", "name")
+        self.by_name = {name.casefold(): pk for pk, name in rows}
+        self.ids = set(self.by_name.values())
+
+    def resolve(self, row):
+        name = row.get("category")
+        if name not in (None, ""):
+            return self.by_name.get(str(name).strip().casefold())
+        category_id = row.get("category_id")
+        try:
+            category_id = int(category_id)
+        except (TypeError, ValueError):
+            return None
+        return category_id if category_id in self.ids else None
+
+
+def parse_rows(lines, input_format: str):
+    """Yield ``(row_number, row)`` from an iterable of text lines, one row at a time."""
+    if input_format == "csv":
+        # The csv module refuses fields over 128 KiB by default; notes may be longer.
+        csv.field_size_limit(settings.NOTES_IMPORT_MAX_FIELD_SIZE)
+        yield from enumerate(csv.DictReader(lines), start=1)
+        return
+    row_number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield row_number, row
+
+
+def decode_lines(binary_lines, encoding="utf-8-sig"):
+    """Decode a binary line stream lazily; the default encoding drops a leading BOM."""
+    first = True
+    for line in binary_lines:
+        yield line.decode(encoding if first else "utf-8")
+        first = False
+
+
+def _validate_row(row, categories):
+    """Return ``(validated_data, None)`` or ``(None, errors)`` for one input row."""
+    if not isinstance(row, dict):
+        return None, {"detail": ["Expected an object."]}
+    category_id = categories.resolve(row)
+    data = {field: row[field] for field in ("title", "content") if field in row}
+    serializer = NoteBulkCreateSerializer(data={**data, "category_id": category_id or 0})
+    errors = {} if serializer.is_valid() else dict(serializer.errors)
+    if category_id is None:
+        errors["category"] = ["Unknown category."]
+    return (None, errors) if errors else (serializer.validated_data, None)
+
+
+def _flush(user_id, batch):
+    with transaction.atomic():
+        notes = Note.objects.bulk_create(batch)
+        notes_bulk_changed.send(
+            sender=Note, user_id=user_id, action="created", note_ids=[note.pk for note in notes]
+        )
+    return len(notes)
+
+
+def import_notes(user_id, lines, input_format="ndjson", batch_size=None):
+    """
+    Import notes for ``user_id`` from NDJSON or CSV ``lines``, inserting every
+    ``batch_size`` valid rows with one ``bulk_create`` in its own transaction.
+
+    Rows carry ``title``, ``content`` and either a ``category`` name or a
+    ``category_id`` (the export format is accepted as is). A line that is not
+    valid UTF-8, or malformed CSV, ends the import as a failed row. Returns a report with the
+    number of notes created, the failed rows (the first
+    ``NOTES_IMPORT_MAX_ERRORS`` are listed) and the throughput.
+    """
+    batch_size = batch_size or settings.NOTES_IMPORT_BATCH_SIZE
+    max_errors = settings.NOTES_IMPORT_MAX_ERRORS
+    categories = CategoryResolver()
+    started = time.perf_counter()
+    created = failed = rows = 0
+    errors, batch = [], []
+
+    try:
+        for row_number, row in parse_rows(lines, input_format):
+            rows += 1
+            data, row_errors = _validate_row(row, categories)
+            if row_errors:
+                failed += 1
+                if len(errors) < max_errors:
+                    errors.append({"row": row_number, "errors": row_errors})
+                continue
+            batch.append(Note(user_id=user_id, **data))
+            if len(batch) >= batch_size:
+                created += _flush(user_id, batch)
+                batch = []
+    except (UnicodeDecodeError, csv.Error) as exc:
+        # The line stream cannot go on; keep what was read and stop here.
+        rows += 1
+        failed += 1
+        reason = "Invalid UTF-8" if isinstance(exc, UnicodeDecodeError) else f"Malformed CSV ({exc})"
+        if len(errors) < max_errors:
+            errors.append({"row": rows, "errors": {"detail": [f"{reason}; the import stopped here."]}})
+    if batch:
+        created += _flush(user_id, batch)
+
+    seconds = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "created": created,
+        "failed": failed,
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds, 1) if seconds else None,
+    }
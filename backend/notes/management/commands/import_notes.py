@@ -0,0 +1,41 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from notes.importer import INPUT_FORMATS, import_notes
+
+
+class Command(BaseCommand):
+    help = "Imports notes for a user from an NDJSON or CSV file, inserting them in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - for stdin.")
+        parser.add_argument("--user", required=True, help="Email of the user who will own the notes.")
+        parser.add_argument(
+            "--input", dest="input_format", choices=INPUT_FORMATS, help="Defaults to the file extension."
+        )
+        parser.add_argument("--batch-size", type=int)
+
+    def handle(self, *args, path, user, input_format, batch_size, **options):
+        try:
+            user_id = get_user_model().objects.by_email(user).values_list("id", flat=True).get()
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No user with email {user!r}.")
+        input_format = input_format or ("csv" if path.endswith(".csv") else "ndjson")
+
+        if path == "-":
+            report = import_notes(user_id, sys.stdin, input_format, batch_size)
+        else:
+            with open(path, encoding="utf-8-sig", newline="") as lines:
+                report = import_notes(user_id, lines, input_format, batch_size)
+
+        for error in report["errors"]:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report['created']} of {report['rows']} rows "
+                f"({report['failed']} failed) in {report['seconds']}s "
+                f"({report['rows_per_second']} rows/s)."
+            )
+        )
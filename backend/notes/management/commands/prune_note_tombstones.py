@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from notes.pruning import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = "Deletes note tombstones older than NOTES_TOMBSTONE_RETENTION_DAYS in bounded chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, chunk_size, **options):
+        reclaimed = prune_tombstones(chunk_size=chunk_size)
+        self.stdout.write(self.style.SUCCESS(f"Reclaimed {reclaimed} note tombstones."))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from notes.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the notes full-text search index in streaming batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, batch_size, database, **options):
+        indexed = 0
+        for indexed in rebuild_index(batch_size=batch_size, using=database):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Indexed {indexed} notes...")
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt search index for {indexed} notes."))
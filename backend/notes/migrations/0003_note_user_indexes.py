@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2 on 2026-10-17 15:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("categories", "0001_initial"),
+        ("notes", "0002_alter_note_category"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="note",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"], name="notes_user_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="note",
+            index=models.Index(
+                fields=["user", "category", "-created_at"], name="notes_user_category_idx"
+            ),
+        ),
+    ]
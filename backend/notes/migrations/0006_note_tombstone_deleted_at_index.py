@@ -0,0 +1,19 @@
+# Generated by Django 6.0.2 on 2026-10-17 18:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notes", "0005_notetombstone"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notetombstone",
+            index=models.Index(fields=["deleted_at"], name="note_tombstones_deleted_idx"),
+        ),
+    ]
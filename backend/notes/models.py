@@ -23,6 +23,35 @@ class Note(models.Model):
     class Meta:
         db_table = "notes"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "-created_at", "-id"], name="notes_user_created_idx"),
+            models.Index(
+                fields=["user", "category", "-created_at"], name="notes_user_category_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.title
+
+
+class NoteTombstone(models.Model):
+    """Records a deleted note so sync clients can drop their local copy."""
+
+    note_id = models.BigIntegerField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="note_tombstones",
+    )
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "note_tombstones"
+        ordering = ["deleted_at"]
+        indexes = [
+            models.Index(fields=["user", "deleted_at"], name="note_tombstones_user_idx"),
+            models.Index(fields=["deleted_at"], name="note_tombstones_deleted_idx"),
+        ]
+
+    def __str__(self):
+        return f"Note {self.note_id} deleted at {self.deleted_at}"
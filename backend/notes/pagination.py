@@ -0,0 +1,82 @@
+from datetime import datetime
+
+from django.conf import settings
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+class NoteCursorPagination(CursorPagination):
+    """
+    Keyset pagination over ``(created_at, id)``.
+
+    Unlike DRF's ``CursorPagination`` the cursor position holds both keys, so
+    pages never need an offset and no ``COUNT(*)`` query is issued.
+    """
+
+    ordering = ("-created_at", "-id")
+    mode_query_param = "pagination"
+
+    @classmethod
+    def is_requested(cls, request):
+        params = request.query_params
+        if cls.cursor_query_param in params:
+            return True
+        mode = params.get(cls.mode_query_param, getattr(settings, "NOTES_PAGINATION", "page"))
+        return mode == "cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        reverse = self.cursor is not None and self.cursor.reverse
+        if self.cursor is not None:
+            created_at, pk = self._decode_position(self.cursor.position)
+            if reverse:
+                queryset = (
+                    queryset.filter(created_at__gte=created_at)
+                    .exclude(created_at=created_at, id__lte=pk)
+                    .order_by("created_at", "id")
+                )
+            else:
+                queryset = queryset.filter(created_at__lte=created_at).exclude(
+                    created_at=created_at, id__gte=pk
+                )
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=False, position=self._encode_position(self.page[-1]))
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=True, position=self._encode_position(self.page[0]))
+        )
+
+    def _encode_position(self, note):
+        if isinstance(note, dict):  # values() rows
+            return f"{note['created_at'].isoformat()},{note['id']}"
+        return f"{note.created_at.isoformat()},{note.pk}"
+
+    def _decode_position(self, position):
+        try:
+            created_at, pk = position.rsplit(",", 1)
+            return datetime.fromisoformat(created_at), int(pk)
+        except (AttributeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
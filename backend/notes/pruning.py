@@ -0,0 +1,48 @@
+import logging
+import threading
+from functools import partial
+
+from django.db import transaction
+
+from turbo_back import periodic
+
+from .models import NoteTombstone
+from .sync import tombstone_cutoff
+
+logger = logging.getLogger(__name__)
+
+THREAD_NAME = "tombstone-pruning"
+
+
+def prune_tombstones(chunk_size: int = 1000, now=None) -> int:
+    """
+    Delete tombstones older than ``NOTES_TOMBSTONE_RETENTION_DAYS`` in chunks
+    of ``chunk_size``. Returns the number of rows reclaimed.
+    """
+    cutoff = tombstone_cutoff(now)
+    reclaimed = 0
+    while True:
+        ids = list(
+            NoteTombstone.objects.filter(deleted_at__lt=cutoff)
+            .order_by()
+            .values_list("id", flat=True)[:chunk_size]
+        )
+        if not ids:
+            return reclaimed
+        with transaction.atomic():
+            deleted, _ = NoteTombstone.objects.filter(id__in=ids).delete()
+        reclaimed += deleted
+
+
+def _prune_and_log(chunk_size: int) -> None:
+    logger.info("Pruned %s note tombstones", prune_tombstones(chunk_size=chunk_size))
+
+
+def start_periodic_pruning(
+    interval: float | None, chunk_size: int = 1000
+) -> threading.Event | None:
+    """
+    Prune tombstones every ``interval`` seconds on a daemon thread (None
+    disables it). Returns the running thread's stop event.
+    """
+    return periodic.start(THREAD_NAME, interval, partial(_prune_and_log, chunk_size))
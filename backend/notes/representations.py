@@ -0,0 +1,90 @@
+"""
+Serializer-free representations of notes for the list and detail endpoints.
+
+They return the same data as ``NoteSerializer`` (the tests check parity) but
+build it straight from ``values()`` rows or loaded instances. Requests that
+change the representation (search, sparse fieldsets, previews) still go
+through the serializers.
+"""
+
+from categories.representations import category_data, datetime_formatter
+
+NOTE_VALUES = (
+    "id",
+    "title",
+    "content",
+    "category_id",
+    "category__name",
+    "category__created_at",
+    "category__updated_at",
+    "created_at",
+    "updated_at",
+)
+
+
+def note_rows(queryset):
+    """The columns ``represent_notes`` needs, with the category joined in."""
+    return queryset.values(*NOTE_VALUES)
+
+
+def note_data(format_datetime, id, title, content, category, created_at, updated_at) -> dict:
+    return {
+        "id": id,
+        "title": title,
+        "content": content,
+        "category": category,
+        "created_at": format_datetime(created_at),
+        "updated_at": format_datetime(updated_at),
+    }
+
+
+def represent_notes(rows) -> list:
+    """Render ``note_rows()`` rows; each category is rendered once per call."""
+    format_datetime = datetime_formatter()
+    categories = {}
+
+    def category(row):
+        category_id = row["category_id"]
+        if category_id is None:
+            return None
+        if category_id not in categories:
+            categories[category_id] = category_data(
+                format_datetime,
+                category_id,
+                row["category__name"],
+                row["category__created_at"],
+                row["category__updated_at"],
+            )
+        return categories[category_id]
+
+    return [
+        note_data(
+            format_datetime,
+            row["id"],
+            row["title"],
+            row["content"],
+            category(row),
+            row["created_at"],
+            row["updated_at"],
+        )
+        for row in rows
+    ]
+
+
+def represent_note(note) -> dict:
+    """Render a ``Note`` instance (with its category loaded) like ``NoteSerializer(note).data``."""
+    format_datetime = datetime_formatter()
+    category = note.category
+    if category is not None:
+        category = category_data(
+            format_datetime, category.pk, category.name, category.created_at, category.updated_at
+        )
+    return note_data(
+        format_datetime,
+        note.pk,
+        note.title,
+        note.content,
+        category,
+        note.created_at,
+        note.updated_at,
+    )
@@ -0,0 +1,118 @@
+import html
+
+from django.db import connections, transaction
+from django.db.models import FloatField, Q, Value
+from django.db.models.functions import Substr
+
+from .models import Note
+
+SQLITE_TABLE = "notes_fts"
+# The indexed text; ts_headline must highlight the same text that matched.
+POSTGRES_DOCUMENT = "coalesce(notes.title, '') || ' ' || coalesce(notes.content, '')"
+POSTGRES_VECTOR = f"to_tsvector('english', {POSTGRES_DOCUMENT})"
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+# The database marks matches with these private-use characters; the snippet
+# is HTML-escaped before they are swapped for the real tags.
+MATCH_START = "\ue000"
+MATCH_END = "\ue001"
+SNIPPET_ELLIPSIS = "…"
+SNIPPET_TOKENS = 16
+SNIPPET_FALLBACK_LENGTH = 200
+
+
+def _fts5_query(query):
+    """Quote every term so user input can't inject FTS5 syntax; prefix-match the last one."""
+    terms = ['"{}"'.format(term.replace('"', '""')) for term in query.split()]
+    if terms:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def render_snippet(snippet):
+    """HTML-escape a raw ``snippet`` annotation and wrap its matches in ``<mark>``."""
+    if snippet is None:
+        return None
+    return (
+        html.escape(snippet)
+        .replace(MATCH_START, HIGHLIGHT_START)
+        .replace(MATCH_END, HIGHLIGHT_END)
+    )
+
+
+def search_notes(queryset, query):
+    """
+    Filter ``queryset`` to notes matching ``query``, annotated with ``rank``
+    (higher is better) and a raw ``snippet`` for ``render_snippet``, best
+    matches first.
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor == "sqlite":
+        queryset = queryset.extra(
+            tables=[SQLITE_TABLE],
+            where=[f"{SQLITE_TABLE}.rowid = notes.id", f"{SQLITE_TABLE} MATCH %s"],
+            params=[_fts5_query(query)],
+            select={
+                # bm25() is lower-is-better; flip it so both backends rank descending.
+                "rank": f"-bm25({SQLITE_TABLE})",
+                "snippet": f"snippet({SQLITE_TABLE}, -1, %s, %s, %s, %s)",
+            },
+            select_params=[MATCH_START, MATCH_END, SNIPPET_ELLIPSIS, SNIPPET_TOKENS],
+        )
+    elif vendor == "postgresql":
+        tsquery = "websearch_to_tsquery('english', %s)"
+        headline_options = (
+            f"StartSel={MATCH_START}, StopSel={MATCH_END}, MaxWords={SNIPPET_TOKENS}"
+        )
+        queryset = queryset.extra(
+            where=[f"{POSTGRES_VECTOR} @@ {tsquery}"],
+            params=[query],
+            select={
+                "rank": f"ts_rank({POSTGRES_VECTOR}, {tsquery})",
+                "snippet": f"ts_headline('english', {POSTGRES_DOCUMENT}, {tsquery}, %s)",
+            },
+            select_params=[query, query, headline_options],
+        )
+    else:
+        queryset = queryset.filter(Q(title__icontains=query) | Q(content__icontains=query))
+        queryset = queryset.annotate(
+            rank=Value(0.0, output_field=FloatField()),
+            snippet=Substr("content", 1, SNIPPET_FALLBACK_LENGTH),
+        )
+    return queryset.order_by("-rank", "-created_at", "-id")
+
+
+def rebuild_index(batch_size=1000, using="default"):
+    """
+    Rebuild the full-text index, yielding the number of notes indexed after
+    each batch. Notes are streamed by primary key so memory stays flat.
+    """
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("REINDEX INDEX notes_search_idx")
+        yield Note.objects.using(using).count()
+        return
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {SQLITE_TABLE}({SQLITE_TABLE}) VALUES ('delete-all')")
+
+    indexed, last_id = 0, 0
+    while True:
+        rows = list(
+            Note.objects.using(using)
+            .filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", "title", "content")[:batch_size]
+        )
+        if not rows:
+            break
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {SQLITE_TABLE}(rowid, title, content) VALUES (%s, %s, %s)", rows
+            )
+        indexed += len(rows)
+        last_id = rows[-1][0]
+        yield indexed
@@ -3,7 +3,9 @@ from rest_framework import serializers
 from categories.models import Category
 from categories.serializers import CategorySerializer
 
+from .fieldsets import READABLE_FIELDS
 from .models import Note
+from .search import render_snippet
 
 
 class NoteSerializer(serializers.ModelSerializer):
@@ -26,3 +28,95 @@ class NoteSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["id", "created_at", "updated_at"]
+
+    def __init__(self, *args, fields=None, preview=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(READABLE_FIELDS) - set(fields):
+                self.fields.pop(name, None)
+        if preview and "content" in self.fields:
+            self.fields["content"] = serializers.CharField(source="content_preview", read_only=True)
+
+
+class SnippetField(serializers.CharField):
+    """Search snippet as HTML: escaped note text with matches in ``<mark>`` tags."""
+
+    def to_representation(self, value):
+        return render_snippet(value)
+
+
+class NoteSearchSerializer(NoteSerializer):
+    rank = serializers.FloatField(read_only=True)
+    snippet = SnippetField(read_only=True)
+
+    class Meta(NoteSerializer.Meta):
+        fields = NoteSerializer.Meta.fields + ["rank", "snippet"]
+
+
+class NoteBulkCreateSerializer(serializers.ModelSerializer):
+    # Plain integer: categories are resolved for the whole batch in one query.
+    category_id = serializers.IntegerField()
+
+    class Meta:
+        model = Note
+        fields = ["title", "content", "category_id"]
+
+
+class NoteBulkUpdateSerializer(NoteBulkCreateSerializer):
+    id = serializers.IntegerField()
+
+    class Meta(NoteBulkCreateSerializer.Meta):
+        fields = ["id", *NoteBulkCreateSerializer.Meta.fields]
+
+
+class NoteBulkDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+
+# --- Response serializers (OpenAPI documentation only) ---
+
+
+class CategoryCountSerializer(serializers.Serializer):
+    category_id = serializers.IntegerField(allow_null=True)
+    count = serializers.IntegerField()
+
+
+class NoteStatsSerializer(serializers.Serializer):
+    total = serializers.IntegerField()
+    categories = CategoryCountSerializer(many=True)
+
+
+class NoteSyncSerializer(serializers.Serializer):
+    watermark = serializers.CharField()
+    full = serializers.BooleanField()
+    notes = NoteSerializer(many=True)
+    deleted = serializers.ListField(child=serializers.IntegerField())
+
+
+class BulkItemErrorSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    errors = serializers.DictField()
+
+
+class NoteBulkResponseSerializer(serializers.Serializer):
+    results = NoteSerializer(many=True)
+    errors = BulkItemErrorSerializer(many=True)
+
+
+class NoteBulkDeleteResponseSerializer(serializers.Serializer):
+    deleted = serializers.ListField(child=serializers.IntegerField())
+    errors = BulkItemErrorSerializer(many=True)
+
+
+class ImportRowErrorSerializer(serializers.Serializer):
+    row = serializers.IntegerField()
+    errors = serializers.DictField()
+
+
+class NoteImportReportSerializer(serializers.Serializer):
+    rows = serializers.IntegerField()
+    created = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    errors = ImportRowErrorSerializer(many=True)
+    seconds = serializers.FloatField()
+    rows_per_second = serializers.FloatField(allow_null=True)
@@ -0,0 +1,49 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from . import cache, events
+from .models import Note, NoteTombstone
+
+# Sent by the bulk paths, which bypass post_save: sender=Note, user_id, action
+# ("created" or "updated") and note_ids.
+notes_bulk_changed = Signal()
+
+
+@receiver(post_save, sender=Note)
+def publish_note_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        action = "created" if created else "updated"
+        events.publish_on_commit(instance.user_id, action, [instance.pk])
+
+
+@receiver(post_delete, sender=Note)
+def record_note_tombstone(sender, instance, origin=None, **kwargs):
+    """
+    Record every note deletion for delta sync, inside the delete's transaction.
+    Notes cascading from a deleted user are skipped: their tombstones would
+    reference the user being deleted, and nobody is left to sync them.
+    """
+    if isinstance(origin, Note) or (isinstance(origin, QuerySet) and origin.model is Note):
+        NoteTombstone.objects.create(note_id=instance.pk, user_id=instance.user_id)
+
+
+@receiver(post_delete, sender=Note)
+def publish_note_deleted(sender, instance, **kwargs):
+    events.publish_on_commit(instance.user_id, "deleted", [instance.pk])
+
+
+@receiver(notes_bulk_changed, sender=Note)
+def publish_notes_bulk_changed(sender, user_id, action, note_ids, **kwargs):
+    events.publish_on_commit(user_id, action, note_ids)
+
+
+@receiver(post_save, sender=Note)
+@receiver(post_delete, sender=Note)
+def invalidate_note_pages(sender, instance, **kwargs):
+    cache.invalidate(instance.user_id)
+
+
+@receiver(notes_bulk_changed, sender=Note)
+def invalidate_note_pages_bulk(sender, user_id, **kwargs):
+    cache.invalidate(user_id)
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+
+from .models import Note, NoteTombstone
+
+WATERMARK_SALT = "notes.sync"
+
+
+class InvalidWatermark(Exception):
+    pass
+
+
+def issue_watermark(moment: datetime) -> str:
+    return signing.dumps(moment.isoformat(), salt=WATERMARK_SALT)
+
+
+def read_watermark(token: str) -> datetime:
+    try:
+        return datetime.fromisoformat(signing.loads(token, salt=WATERMARK_SALT))
+    except (signing.BadSignature, TypeError, ValueError):
+        raise InvalidWatermark(token)
+
+
+def tombstone_cutoff(now=None) -> datetime:
+    """Tombstones older than this are pruned, so watermarks before it need a full sync."""
+    return (now or timezone.now()) - timedelta(days=settings.NOTES_TOMBSTONE_RETENTION_DAYS)
+
+
+def changes_since(user_id, since: datetime | None):
+    """
+    Return ``(watermark, full, notes, deleted_ids)`` for everything that
+    changed after ``since``. When ``since`` is None, or so old that its
+    tombstones may have been pruned, every note is returned (``full``).
+
+    ``updated_at`` is stamped before a transaction commits, so the window is
+    widened by ``NOTES_SYNC_OVERLAP`` to catch slow writers; clients apply
+    changes idempotently, so the occasional repeat is harmless.
+    """
+    now = timezone.now()
+    watermark = issue_watermark(now)
+    notes = Note.objects.filter(user_id=user_id).select_related("category")
+    if since is None or since < tombstone_cutoff(now):
+        return watermark, True, notes, []
+
+    since -= timedelta(seconds=getattr(settings, "NOTES_SYNC_OVERLAP", 5))
+    notes = notes.filter(updated_at__gt=since)
+    deleted = NoteTombstone.objects.filter(user_id=user_id, deleted_at__gt=since).values_list(
+        "note_id", flat=True
+    )
+    return watermark, False, notes, list(deleted)
@@ -1,12 +1,34 @@
+import asyncio
+import csv
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync, sync_to_async
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import AsyncClient, AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from categories.models import Category
 
-from .models import Note
+from . import async_views
+from .checks import _plan_problems, check_hot_query_plans
+from .etags import note_etag
+from .events import MemoryBroker, get_broker
+from .models import Note, NoteTombstone
+from .representations import note_rows, represent_note, represent_notes
+from .serializers import NoteSerializer
 
 User = get_user_model()
 
@@ -216,3 +238,1039 @@ class NotePermissionTest(TestCase):
     def test_cannot_delete_other_users_note(self):
         response = self.client.delete(f"/api/notes/{self.note.id}/")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class NoteCursorPaginationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = "/api/notes/"
+        self.user = User.objects.create_user(email="user@test.com", password="TestPass123!")
+        self.category = Category.objects.create(name="Work")
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        for i in range(5):
+            Note.objects.create(
+                title=f"Note {i}", content="Content", category=self.category, user=self.user
+            )
+        # Two notes sharing a timestamp must still be ordered deterministically by id.
+        first = Note.objects.order_by("id").first()
+        Note.objects.filter(title="Note 1").update(created_at=first.created_at)
+
+    def walk(self, url):
+        titles, pages = [], []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(response.data)
+            titles.extend(note["title"] for note in response.data["results"])
+            url = response.data["next"]
+        return titles, pages
+
+    def test_cursor_mode_skips_count(self):
+        with patch("notes.pagination.NoteCursorPagination.page_size", 2):
+            response = self.client.get(self.url, {"pagination": "cursor"})
+        self.assertNotIn("count", response.data)
+        self.assertIsNone(response.data["previous"])
+        self.assertIsNotNone(response.data["next"])
+
+    def test_cursor_walk_matches_ordering(self):
+        expected = list(
+            Note.objects.order_by("-created_at", "-id").values_list("title", flat=True)
+        )
+        with patch("notes.pagination.NoteCursorPagination.page_size", 2):
+            titles, pages = self.walk(f"{self.url}?pagination=cursor")
+        self.assertEqual(titles, expected)
+        self.assertEqual(len(pages), 3)
+
+    def test_previous_cursor_returns_previous_page(self):
+        with patch("notes.pagination.NoteCursorPagination.page_size", 2):
+            first = self.client.get(self.url, {"pagination": "cursor"}).data
+            second = self.client.get(first["next"]).data
+            back = self.client.get(second["previous"]).data
+        self.assertEqual(
+            [n["id"] for n in back["results"]], [n["id"] for n in first["results"]]
+        )
+        self.assertIsNone(back["previous"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_setting_enables_cursor_mode(self):
+        with self.settings(NOTES_PAGINATION="cursor"):
+            response = self.client.get(self.url)
+        self.assertNotIn("count", response.data)
+        self.assertEqual(len(response.data["results"]), 5)
+
+
+class NoteQueryPlanCheckTest(TestCase):
+    databases = {"default"}
+
+    def test_hot_queries_use_indexes(self):
+        self.assertEqual(check_hot_query_plans(databases=["default"]), [])
+
+    def test_detects_table_scan_and_sort(self):
+        plan = "2 0 0 SCAN notes\n30 0 0 USE TEMP B-TREE FOR ORDER BY"
+        self.assertEqual(
+            list(_plan_problems("sqlite", plan)),
+            ["full table scan on notes", "sort through a temporary B-tree"],
+        )
+
+    def test_index_scan_is_allowed(self):
+        plan = "4 0 0 SCAN notes USING INDEX notes_user_created_idx"
+        self.assertEqual(list(_plan_problems("sqlite", plan)), [])
+
+    def test_scans_of_other_tables_are_allowed(self):
+        plan = (
+            "Hash Join\n  ->  Index Scan using notes_user_created_idx on notes\n"
+            "  ->  Hash\n        ->  Seq Scan on categories"
+        )
+        self.assertEqual(list(_plan_problems("postgresql", plan)), [])
+        self.assertEqual(
+            list(_plan_problems("postgresql", "Seq Scan on notes")), ["sequential scan on notes"]
+        )
+
+
+class NoteFilterAndStatsTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email="user@test.com", password="TestPass123!")
+        self.other_user = User.objects.create_user(email="other@test.com", password="TestPass123!")
+        self.work = Category.objects.create(name="Work")
+        self.personal = Category.objects.create(name="Personal")
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        Note.objects.create(title="W1", content="Content", category=self.work, user=self.user)
+        Note.objects.create(title="W2", content="Content", category=self.work, user=self.user)
+        self.personal_note = Note.objects.create(
+            title="P1", content="Content", category=self.personal, user=self.user
+        )
+        Note.objects.create(title="None", content="Content", user=self.user)
+        Note.objects.create(title="Other", content="Content", category=self.work, user=self.other_user)
+
+    def test_filter_by_category(self):
+        response = self.client.get("/api/notes/", {"category": self.work.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+
+    def test_filter_updated_after(self):
+        Note.objects.exclude(id=self.personal_note.id).update(
+            updated_at=self.personal_note.updated_at - timedelta(days=1)
+        )
+        since = self.personal_note.updated_at - timedelta(seconds=1)
+        response = self.client.get("/api/notes/", {"updated_after": since.isoformat()})
+        self.assertEqual([n["title"] for n in response.data["results"]], ["P1"])
+
+    def test_stats_counts_per_category(self):
+        # One query checks the user is still active (then cached), one aggregates the counts.
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/notes/stats/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["total"], 4)
+        counts = {row["category_id"]: row["count"] for row in response.data["categories"]}
+        self.assertEqual(counts, {None: 1, self.work.id: 2, self.personal.id: 1})
+
+    def test_stats_unauthenticated(self):
+        self.client.credentials()
+        response = self.client.get("/api/notes/stats/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class NoteSearchTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email="user@test.com", password="TestPass123!")
+        self.other_user = User.objects.create_user(email="other@test.com", password="TestPass123!")
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        self.fox = Note.objects.create(
+            title="Animals", content="The quick brown fox jumps over the lazy dog", user=self.user
+        )
+        self.title_match = Note.objects.create(
+            title="Fox facts", content="Foxes are fox-like. A fox is a fox.", user=self.user
+        )
+        Note.objects.create(title="Groceries", content="Milk and eggs", user=self.user)
+        Note.objects.create(title="Fox", content="Someone else's fox", user=self.other_user)
+
+    def search(self, query):
+        response = self.client.get("/api/notes/", {"q": query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["results"]
+
+    def test_search_ranks_own_matches(self):
+        results = self.search("fox")
+        self.assertEqual([n["id"] for n in results], [self.title_match.id, self.fox.id])
+        self.assertIn("<mark>fox</mark>", results[1]["snippet"])
+        self.assertGreaterEqual(results[0]["rank"], results[1]["rank"])
+
+    def test_snippet_escapes_content(self):
+        Note.objects.create(
+            title="Markup", content='<img src=x onerror="alert(1)"> zebra & co', user=self.user
+        )
+        snippet = self.search("zebra")[0]["snippet"]
+        self.assertNotIn("<img", snippet)
+        self.assertIn("&lt;img", snippet)
+        self.assertIn("<mark>zebra</mark> &amp; co", snippet)
+
+    def test_snippet_highlights_title_matches(self):
+        Note.objects.create(title="Badger sightings", content="None this week", user=self.user)
+        self.assertIn("<mark>Badger</mark>", self.search("badger")[0]["snippet"])
+
+    def test_search_prefix_and_stemming(self):
+        self.assertEqual([n["id"] for n in self.search("jump")], [self.fox.id])
+        groceries = Note.objects.get(title="Groceries")
+        self.assertEqual([n["id"] for n in self.search("groc")], [groceries.id])
+
+    def test_search_ignores_query_syntax(self):
+        self.assertEqual(self.search('fox" OR "milk'), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.fox.content = "A sleepy cat"
+        self.fox.save()
+        self.assertEqual([n["id"] for n in self.search("cat")], [self.fox.id])
+        self.assertEqual([n["id"] for n in self.search("jumps")], [])
+        self.fox.delete()
+        self.assertEqual(self.search("cat"), [])
+
+    def test_rebuild_command(self):
+        out = StringIO()
+        call_command("rebuild_note_index", "--batch-size", "2", stdout=out)
+        self.assertIn("Rebuilt search index for 4 notes.", out.getvalue())
+        self.assertEqual(len(self.search("fox")), 2)
+
+
+class NoteConditionalRequestTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email="user@test.com", password="TestPass123!")
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        self.note = Note.objects.create(title="My Note", content="Content", user=self.user)
+        self.url = f"/api/notes/{self.note.id}/"
+
+    def test_retrieve_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_retrieve_modified_after_update(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.note.title = "Changed"
+        self.note.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_not_modified_until_notes_change(self):
+        etag = self.client.get("/api/notes/")["ETag"]
+        response = self.client.get("/api/notes/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Note.objects.create(title="Another", content="Content", user=self.user)
+        response = self.client.get("/api/notes/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+
+    def test_category_changes_modify_etags(self):
+        category = Category.objects.create(name="Work")
+        self.note.category = category
+        self.note.save()
+        list_etag = self.client.get("/api/notes/")["ETag"]
+        detail_etag = self.client.get(self.url)["ETag"]
+
+        category.name = "Office"
+        category.save()
+        response = self.client.get("/api/notes/", HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["category"]["name"], "Office")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        detail_etag = response["ETag"]
+        list_etag = self.client.get("/api/notes/")["ETag"]
+        category.delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data["category"])
+        response = self.client.get("/api/notes/", HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_if_match_survives_cache_eviction(self):
+        etag = self.client.get(self.url)["ETag"]
+        cache.clear()
+        response = self.client.patch(
+            self.url, {"title": "Updated"}, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(NOTES_LIST_CACHE_TIMEOUT=0)
+    def test_cursor_list_etag_needs_no_aggregate(self):
+        url = "/api/notes/?pagination=cursor"
+        with CaptureQueriesContext(connection) as queries:
+            etag = self.client.get(url)["ETag"]
+        note_queries = [query["sql"] for query in queries if '"notes"' in query["sql"]]
+        self.assertEqual(len(note_queries), 1)
+        self.assertNotIn("COUNT(", note_queries[0].upper())
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.note.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_patch_with_matching_if_match(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.patch(
+            self.url, {"title": "Updated"}, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(self.client.get(self.url)["ETag"], response["ETag"])
+
+    def test_patch_with_stale_if_match(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.client.patch(self.url, {"title": "First writer"}, format="json")
+        response = self.client.patch(
+            self.url, {"title": "Second writer"}, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.note.refresh_from_db()
+        self.assertEqual(self.note.title, "First writer")
+
+    def test_if_match_accepts_weakened_etag(self):
+        self.note.content = "lorem ipsum " * 200  # Large enough to be compressed.
+        self.note.save()
+        etag = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")["ETag"]
+        self.assertTrue(etag.startswith("W/"))
+        response = self.client.patch(
+            self.url, {"title": "Updated"}, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.delete(self.url, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+
+    def test_delete_with_stale_if_match(self):
+        response = self.client.delete(self.url, HTTP_IF_MATCH='"stale"')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertTrue(Note.objects.filter(id=self.note.id).exists())
+
+
+class NoteSyncTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = "/api/notes/sync/"
+        self.user = User.objects.create_user(email="user@test.com", password="TestPass123!")
+        self.other_user = User.objects.create_user(email="other@test.com", password="TestPass123!")
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        self.old = Note.objects.create(title="Old", content="Content", user=self.user)
+        self.doomed = Note.objects.create(title="Doomed", content="Content", user=self.user)
+        Note.objects.create(title="Other", content="Content", user=self.other_user)
+
+    def age_everything(self):
+        past = timezone.now() - timedelta(hours=1)
+        Note.objects.update(updated_at=past)
+        NoteTombstone.objects.update(deleted_at=past)
+
+    def test_full_sync_without_watermark(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["full"])
+        self.assertEqual({n["title"] for n in response.data["notes"]}, {"Old", "Doomed"})
+        self.assertEqual(response.data["deleted"], [])
+
+    def test_incremental_sync_returns_changes_and_tombstones(self):
+        self.age_everything()
+        watermark = self.client.get(self.url).data["watermark"]
+
+        self.client.delete(f"/api/notes/{self.doomed.id}/")
+        self.client.patch(f"/api/notes/{self.old.id}/", {"title": "Edited"}, format="json")
+        created = Note.objects.create(title="Fresh", content="Content", user=self.user)
+
+        response = self.client.get(self.url, {"watermark": watermark})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["full"])
+        self.assertEqual(
+            {n["id"] for n in response.data["notes"]}, {self.old.id, created.id}
+        )
+        self.assertEqual(response.data["deleted"], [self.doomed.id])
+
+    def test_other_users_deletions_are_not_visible(self):
+        self.age_everything()
+        watermark = self.client.get(self.url).data["watermark"]
+        other_note = Note.objects.get(title="Other")
+        NoteTombstone.objects.create(note_id=other_note.id, user=self.other_user)
+        response = self.client.get(self.url, {"watermark": watermark})
+        self.assertEqual(response.data["deleted"], [])
+
+    def test_invalid_watermark(self):
+        response = self.client.get(self.url, {"watermark": "forged"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_every_delete_path_records_a_tombstone(self):
+        self.age_everything()
+        watermark = self.client.get(self.url).data["watermark"]
+        doomed_id = self.doomed.id
+        self.doomed.delete()  # e.g. from the admin
+        response = self.client.get(self.url, {"watermark": watermark})
+        self.assertEqual(response.data["deleted"], [doomed_id])
+
+    def test_deleting_a_user_records_no_tombstones(self):
+        self.other_user.delete()
+        self.assertFalse(NoteTombstone.objects.filter(user_id=self.other_user.id).exists())
+
+    def test_watermark_older_than_retention_gets_full_sync(self):
+        self.age_everything()
+        watermark = self.client.get(self.url).data["watermark"]
+        with self.settings(NOTES_TOMBSTONE_RETENTION_DAYS=0):
+            response = self.client.get(self.url, {"watermark": watermark})
+        self.assertTrue(response.data["full"])
+        self.assertEqual(len(response.data["notes"]), 2)
+
+    def test_prune_command(self):
+        doomed_id, old_id = self.doomed.id, self.old.id
+        self.doomed.delete()
+        self.old.delete()
+        NoteTombstone.objects.filter(note_id=old_id).update(
+            deleted_at=timezone.now() - timedelta(days=31)
+        )
+        out = StringIO()
+        call_command("prune_note_tombstones", "--chunk-size", "1", stdout=out)
+        self.assertIn("Reclaimed 1 note tombstones.", out.getvalue())
+        self.assertEqual(
+            list(NoteTombstone.objects.values_list("note_id", flat=True)), [doomed_id]
+        )
+
+
+class NoteBulkTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = "/api/notes/bulk/"
+        self.user = User.objects.create_user(email="user@test.com", password="TestPass123!")
+        self.other_user = User.objects.create_user(email="other@test.com", password="TestPass123!")
+        self.work = Category.objects.create(name="Work")
+        self.personal = Category.objects.create(name="Personal")
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+    def test_bulk_create(self):
+        data = [
+            {"title": f"Note {i}", "content": "Content", "category_id": self.work.id}
+            for i in range(20)
+        ]
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["results"]), 20)
+        self.assertEqual(response.data["results"][0]["category"]["name"], "Work")
+        self.assertEqual(response.data["errors"], [])
+        self.assertEqual(Note.objects.filter(user=self.user).count(), 20)
+
+    def test_bulk_create_validates_categories_in_one_query(self):
+        data = [
+            {"title": f"Note {i}", "content": "Content", "category_id": self.work.id}
+            for i in range(20)
+        ]
+        # Active-user check, one category IN query, one bulk INSERT (plus savepoint handling).
+        with self.assertNumQueries(5):
+            self.client.post(self.url, data, format="json")
+
+    def test_bulk_create_reports_item_errors(self):
+        data = [
+            {"title": "Good", "content": "Content", "category_id": self.work.id},
+            {"content": "Missing title", "category_id": self.work.id},
+            {"title": "Bad category", "content": "Content", "category_id": 9999},
+        ]
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([n["title"] for n in response.data["results"]], ["Good"])
+        self.assertEqual([e["index"] for e in response.data["errors"]], [1, 2])
+        self.assertIn("title", response.data["errors"][0]["errors"])
+        self.assertIn("category_id", response.data["errors"][1]["errors"])
+
+    def test_bulk_create_all_invalid(self):
+        response = self.client.post(self.url, [{"title": "No content"}], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Note.objects.exists())
+
+    def test_bulk_create_rejects_non_list(self):
+        response = self.client.post(self.url, {"title": "Single"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_create_enforces_limit(self):
+        data = [{"title": "N", "content": "C", "category_id": self.work.id}] * 3
+        with self.settings(NOTES_BULK_MAX_ITEMS=2):
+            response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update(self):
+        note = Note.objects.create(title="A", content="C", category=self.work, user=self.user)
+        other = Note.objects.create(title="B", content="C", category=self.work, user=self.other_user)
+        data = [
+            {"id": note.id, "title": "A2", "category_id": self.personal.id},
+            {"id": other.id, "title": "Hacked"},
+            {"title": "No id"},
+        ]
+        response = self.client.patch(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["title"], "A2")
+        self.assertEqual([e["index"] for e in response.data["errors"]], [1, 2])
+        note.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((note.title, note.category, note.content), ("A2", self.personal, "C"))
+        self.assertGreater(note.updated_at, note.created_at)
+        self.assertEqual(other.title, "B")
+
+    def test_bulk_delete_records_tombstones(self):
+        notes = [
+            Note.objects.create(title=str(i), content="C", user=self.user) for i in range(3)
+        ]
+        other = Note.objects.create(title="Other", content="C", user=self.other_user)
+        ids = [notes[0].id, notes[1].id, other.id]
+        response = self.client.delete(self.url, {"ids": ids}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["deleted"], [notes[0].id, notes[1].id])
+        self.assertEqual(response.data["errors"], [{"index": 2, "errors": {"id": ["Not found."]}}])
+        self.assertEqual(
+            list(Note.objects.filter(user=self.user).values_list("id", flat=True)), [notes[2].id]
+        )
+        self.assertTrue(Note.objects.filter(id=other.id).exists())
+        self.assertEqual(NoteTombstone.objects.filter(user=self.user).count(), 2)
+
+
+class NoteSparseFieldsTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = "/api/notes/"
+        self.user = User.objects.create_user(email="user@test.com", password="TestPass123!")
+        self.category = Category.objects.create(name="Work")
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        self.note = Note.objects.create(
+            title="Long", content="x" * 1000, category=self.category, user=self.user
+        )
+
+    def get_note(self, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Authentication and the page count may query first; pick the page query itself.
+        page_query = next(
+            q["sql"]
+            for q in queries
+            if q["sql"].startswith("SELECT") and 'FROM "notes"' in q["sql"] and "LIMIT" in q["sql"]
+        )
+        return response.data["results"][0], page_query
+
+    def test_fields(self):
+        note, sql = self.get_note({"fields": "id,title"})
+        self.assertEqual(set(note), {"id", "title"})
+        self.assertNotIn('"notes"."content"', sql)
+        self.assertNotIn("categories", sql)
+
+    def test_omit_content(self):
+        note, sql = self.get_note({"omit": "content"})
+        self.assertEqual(
+            set(note), {"id", "title", "category", "created_at", "updated_at"}
+        )
+        self.assertEqual(note["category"]["name"], "Work")
+        self.assertNotIn('"notes"."content"', sql.split("FROM")[0])
+
+    def test_preview_truncates_in_sql(self):
+        with self.settings(NOTES_PREVIEW_LENGTH=50):
+            note, sql = self.get_note({"preview": "true"})
+        self.assertEqual(note["content"], "x" * 50)
+        self.assertIn("SUBSTR", sql.upper())
+
+    def test_unknown_field(self):
+        response = self.client.get(self.url, {"fields": "id,password"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_detail_ignores_fieldset(self):
+        response = self.client.get(f"{self.url}{self.note.id}/", {"fields": "id"})
+        self.assertIn("content", response.data)
+
+    def test_fields_with_cursor_pagination(self):
+        Note.objects.create(title="Second", content="C", category=self.category, user=self.user)
+        with patch("notes.pagination.NoteCursorPagination.page_size", 1):
+            first = self.client.get(self.url, {"pagination": "cursor", "fields": "title"}).data
+            second = self.client.get(first["next"]).data
+        titles = [n["title"] for n in first["results"] + second["results"]]
+        self.assertEqual(titles, ["Second", "Long"])
+
+
+class NoteAsyncViewsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="user@test.com", password="TestPass123!")
+        other_user = User.objects.create_user(email="other@test.com", password="TestPass123!")
+        self.category = Category.objects.create(name="Work")
+        self.note = Note.objects.create(
+            title="Mine", content="Content", category=self.category, user=self.user
+        )
+        self.other_note = Note.objects.create(
+            title="Theirs", content="Content", category=self.category, user=other_user
+        )
+        self.auth = f"Bearer {RefreshToken.for_user(self.user).access_token}"
+        self.factory = AsyncRequestFactory()
+
+    def _request(self, method, path="/", data=None, headers=None, **kwargs):
+        if data is not None and method in ("post", "patch"):
+            kwargs.setdefault("content_type", "application/json")
+        headers = {"Authorization": self.auth, **(headers or {})}
+        return getattr(self.factory, method)(path, data, headers=headers, **kwargs)
+
+    def _json(self, response):
+        return json.loads(response.content)
+
+    async def test_list_matches_sync_view(self):
+        response = await async_views.note_list(self._request("get", "/api/notes/"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=self.auth)
+        sync_response = await sync_to_async(client.get)("/api/notes/")
+        self.assertEqual(self._json(response), sync_response.json())
+        self.assertEqual(response["ETag"], sync_response["ETag"])
+
+        cached = await async_views.note_list(
+            self._request("get", "/api/notes/", headers={"If-None-Match": response["ETag"]})
+        )
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_unauthenticated(self):
+        request = AsyncRequestFactory().get("/api/notes/")
+        response = await async_views.note_list(request)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response["WWW-Authenticate"], 'Bearer realm="api"')
+
+    async def test_create(self):
+        request = self._request(
+            "post", "/api/notes/", {"title": "New", "content": "Body", "category_id": self.category.id}
+        )
+        response = await async_views.note_list(request)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self._json(response)["category"]["name"], "Work")
+        self.assertTrue(await Note.objects.filter(user=self.user, title="New").aexists())
+
+        request = self._request(
+            "post", "/api/notes/", {"title": "New", "content": "Body", "category_id": 9999}
+        )
+        response = await async_views.note_list(request)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("category_id", self._json(response))
+
+    async def test_retrieve_only_own_notes(self):
+        response = await async_views.note_detail(self._request("get"), pk=self.note.pk)
+        self.assertEqual(self._json(response)["title"], "Mine")
+        response = await async_views.note_detail(self._request("get"), pk=self.other_note.pk)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_update_honors_if_match(self):
+        request = self._request("patch", data={"title": "Edited"}, headers={"If-Match": '"stale"'})
+        response = await async_views.note_detail(request, pk=self.note.pk)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+
+        request = self._request("patch", data={"title": "Edited"})
+        response = await async_views.note_detail(request, pk=self.note.pk)
+        self.assertEqual(self._json(response)["title"], "Edited")
+        note = await Note.objects.select_related("category").aget(pk=self.note.pk)
+        self.assertEqual(response["ETag"], note_etag(note))
+
+    async def test_delete_writes_tombstone(self):
+        response = await async_views.note_detail(self._request("delete"), pk=self.note.pk)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(await Note.objects.filter(pk=self.note.pk).aexists())
+        self.assertTrue(await NoteTombstone.objects.filter(note_id=self.note.pk).aexists())
+
+    async def test_unsupported_params_use_sync_viewset(self):
+        response = await async_views.note_list(self._request("get", "/api/notes/", {"q": "mine"}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("rank", response.data["results"][0])
+
+
+class NoteEventsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="user@test.com", password="TestPass123!")
+        self.category = Category.objects.create(name="Work")
+        self.client = APIClient()
+        self.auth = f"Bearer {RefreshToken.for_user(self.user).access_token}"
+        self.client.credentials(HTTP_AUTHORIZATION=self.auth)
+
+    def _history(self):
+        return [(event.type, event.data["id"]) for event in get_broker()._users[self.user.id].events]
+
+    def test_save_delete_and_bulk_paths_publish_after_commit(self):
+        with self.settings(NOTES_EVENTS={"BACKEND": "notes.events.MemoryBroker"}, NOTES_ASYNC_VIEWS=True):
+            with self.captureOnCommitCallbacks(execute=True):
+                note_id = self.client.post(
+                    "/api/notes/",
+                    {"title": "A", "content": "B", "category_id": self.category.id},
+                    format="json",
+                ).data["id"]
+            with self.captureOnCommitCallbacks(execute=True):
+                bulk = self.client.post(
+                    "/api/notes/bulk/",
+                    [{"title": "C", "content": "D", "category_id": self.category.id}],
+                    format="json",
+                ).data["results"]
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.delete(f"/api/notes/{note_id}/")
+            self.assertEqual(
+                self._history(),
+                [("note.created", note_id), ("note.created", bulk[0]["id"]), ("note.deleted", note_id)],
+            )
+
+    def test_nothing_published_without_the_stream(self):
+        with self.settings(NOTES_EVENTS={"BACKEND": "notes.events.MemoryBroker"}):
+            with self.captureOnCommitCallbacks(execute=True):
+                Note.objects.create(title="A", content="B", user=self.user)
+            self.assertFalse(get_broker()._users)
+
+    async def test_memory_broker_tracks_bounded_users(self):
+        broker = MemoryBroker(max_users=2)
+        subscription = broker.subscribe(1)
+        for user_id in (1, 2, 3, 4):
+            broker.publish(user_id, "created", [user_id])
+        # User 1 is subscribed, so user 2 went first, then 3.
+        self.assertEqual(list(broker._users), [1, 4])
+        subscription.close()
+        broker.publish(5, "created", [5])
+        self.assertEqual(list(broker._users), [4, 5])
+        # A dropped user's old IDs can no longer be replayed.
+        self.assertEqual((await broker.subscribe(2, last_event_id=2).get()).type, "reset")
+
+    async def test_memory_broker_resume(self):
+        broker = MemoryBroker(history_size=2)
+        broker.publish(1, "created", [10, 11])
+        subscription = broker.subscribe(1, last_event_id=1)
+        self.assertEqual((await subscription.get()).data, {"id": 11})
+        broker.publish(1, "updated", [10])
+        event = await asyncio.wait_for(subscription.get(), 1)
+        self.assertEqual((event.id, event.type), (3, "note.updated"))
+        subscription.close()
+
+        # Event 1 has been evicted: resuming after it still works, resuming before it can't.
+        self.assertEqual((await broker.subscribe(1, last_event_id=1).get()).id, 2)
+        self.assertEqual((await broker.subscribe(1, last_event_id=0).get()).type, "reset")
+
+    async def test_memory_broker_resets_unknown_ids(self):
+        broker = MemoryBroker()
+        broker.publish(1, "created", [10])
+        # Ahead of the broker, e.g. issued before a restart.
+        reset = await broker.subscribe(1, last_event_id=5).get()
+        self.assertEqual((reset.id, reset.type), (1, "reset"))
+        # Resuming after the reset starts from now.
+        subscription = broker.subscribe(1, last_event_id=reset.id)
+        broker.publish(1, "updated", [10])
+        self.assertEqual((await asyncio.wait_for(subscription.get(), 1)).id, 2)
+        subscription.close()
+        # Behind the point where the broker started tracking the user.
+        broker.publish(2, "created", [20])
+        self.assertEqual((await broker.subscribe(2, last_event_id=1).get()).type, "reset")
+
+    async def test_stream(self):
+        with self.settings(NOTES_EVENTS={"BACKEND": "notes.events.MemoryBroker", "KEEPALIVE": 5}):
+            request = AsyncRequestFactory().get(
+                "/api/notes/events/", headers={"Authorization": self.auth}
+            )
+            response = await async_views.note_events(request)
+            self.assertEqual(response["Content-Type"], "text/event-stream")
+            stream = aiter(response.streaming_content)
+            self.assertEqual(await anext(stream), b"retry: 3000\n\n")
+
+            get_broker().publish(self.user.id, "updated", [42])
+            chunk = await asyncio.wait_for(anext(stream), 1)
+            self.assertEqual(chunk, b'id: 1\nevent: note.updated\ndata: {"id": 42}\n\n')
+            await stream.aclose()
+        self.assertFalse(get_broker()._subscribers)
+
+    def test_stream_not_served_by_wsgi(self):
+        # NOTES_ASYNC_VIEWS is off under the test runner, as under WSGI.
+        self.assertEqual(self.client.get("/api/notes/events/").status_code, status.HTTP_404_NOT_FOUND)
+        response = async_to_sync(async_views.note_events)(RequestFactory().get("/api/notes/events/"))
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+    async def test_stream_requires_authentication(self):
+        response = await async_views.note_events(AsyncRequestFactory().get("/api/notes/events/"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class NoteExportTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email="user@test.com", password="TestPass123!")
+        other_user = User.objects.create_user(email="other@test.com", password="TestPass123!")
+        self.auth = f"Bearer {RefreshToken.for_user(self.user).access_token}"
+        self.client.credentials(HTTP_AUTHORIZATION=self.auth)
+        self.work = Category.objects.create(name="Work")
+        self.home = Category.objects.create(name="Home")
+        self.first = Note.objects.create(
+            title="First", content="Line one\nline, two", category=self.work, user=self.user
+        )
+        self.second = Note.objects.create(
+            title="Second", content="Ünïcode", category=self.home, user=self.user
+        )
+        Note.objects.create(title="Theirs", content="x", category=self.work, user=other_user)
+
+    def _body(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_ndjson_export(self):
+        response = self.client.get("/api/notes/export/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in self._body(response).splitlines()]
+        self.assertEqual([row["title"] for row in rows], ["Second", "First"])
+        self.assertEqual(rows[0]["category"], "Home")
+        self.assertEqual(rows[0]["content"], "Ünïcode")
+        self.assertEqual(rows[1]["content"], "Line one\nline, two")
+
+    def test_csv_export_honors_filters(self):
+        response = self.client.get("/api/notes/export/", {"output": "csv", "category": self.work.id})
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="notes.csv"')
+        rows = list(csv.DictReader(StringIO(self._body(response))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["id"], str(self.first.id))
+        self.assertEqual(rows[0]["content"], "Line one\nline, two")
+
+    def test_rows_are_fetched_in_chunks(self):
+        with self.settings(NOTES_EXPORT_CHUNK_SIZE=1), patch.object(
+            QuerySet, "iterator", autospec=True, side_effect=QuerySet.iterator
+        ) as iterator:
+            response = self.client.get("/api/notes/export/")
+            self.assertEqual(len(self._body(response).splitlines()), 2)
+        self.assertEqual(iterator.call_args.kwargs, {"chunk_size": 1})
+
+    async def test_asgi_export_streams_asynchronously(self):
+        client = AsyncClient()
+        with self.settings(NOTES_EXPORT_CHUNK_SIZE=1), patch.object(
+            QuerySet, "aiterator", autospec=True, side_effect=QuerySet.aiterator
+        ) as aiterator:
+            response = await client.get(
+                "/api/notes/export/", {"output": "csv"}, headers={"Authorization": self.auth}
+            )
+            self.assertTrue(response.is_async)
+            body = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        self.assertEqual(aiterator.call_args.kwargs, {"chunk_size": 1})
+        rows = list(csv.DictReader(StringIO(body)))
+        self.assertEqual([row["title"] for row in rows], ["Second", "First"])
+
+    def test_invalid_output(self):
+        response = self.client.get("/api/notes/export/", {"output": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class NoteImportTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email="user@test.com", password="TestPass123!")
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(self.user).access_token}"
+        )
+        self.work = Category.objects.create(name="Work")
+        self.home = Category.objects.create(name="Home")
+
+    def _post(self, body, content_type="application/x-ndjson", **params):
+        url = "/api/notes/import/"
+        if params:
+            url += "?" + "&".join(f"{key}={value}" for key, value in params.items())
+        return self.client.generic("POST", url, body.encode(), content_type=content_type)
+
+    def test_ndjson_import_batches_and_reports_errors(self):
+        lines = [
+            {"title": "One", "content": "a", "category": "work"},
+            {"title": "Two", "content": "b", "category_id": self.home.id},
+            {"title": "Bad", "content": "c", "category": "Nope"},
+            {"content": "no title", "category": "Home"},
+            {"title": "Three", "content": "d", "category": "Home"},
+        ]
+        body = "\n".join(json.dumps(line) for line in lines) + "\n\nnot json\n"
+        with self.settings(NOTES_IMPORT_BATCH_SIZE=2), CaptureQueriesContext(connection) as queries:
+            response = self._post(body)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        report = response.data
+        self.assertEqual((report["rows"], report["created"], report["failed"]), (6, 3, 3))
+        self.assertEqual([error["row"] for error in response.data["errors"]], [3, 4, 6])
+        self.assertIn("category", response.data["errors"][0]["errors"])
+        self.assertIn("title", response.data["errors"][1]["errors"])
+        self.assertIsNotNone(response.data["rows_per_second"])
+
+        inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "notes"')]
+        self.assertEqual(len(inserts), 2)
+        notes = Note.objects.filter(user=self.user).order_by("id")
+        self.assertEqual(
+            list(notes.values_list("title", "category__name")),
+            [("One", "Work"), ("Two", "Home"), ("Three", "Home")],
+        )
+
+    def test_csv_import_roundtrips_export(self):
+        Note.objects.create(title="Multi", content="line 1\nline, 2", category=self.work, user=self.user)
+        export = b"".join(self.client.get("/api/notes/export/?output=csv").streaming_content)
+        Note.objects.all().delete()
+
+        response = self._post(export.decode(), content_type="text/csv")
+        self.assertEqual(response.data["created"], 1)
+        note = Note.objects.get(user=self.user)
+        self.assertEqual((note.content, note.category), ("line 1\nline, 2", self.work))
+
+    def test_csv_import_roundtrips_long_content(self):
+        content = "x" * 200_000
+        Note.objects.create(title="Long", content=content, category=self.work, user=self.user)
+        export = b"".join(self.client.get("/api/notes/export/?output=csv").streaming_content)
+        Note.objects.all().delete()
+
+        response = self._post(export.decode(), content_type="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Note.objects.get(user=self.user).content, content)
+
+    def test_malformed_csv_is_reported(self):
+        body = "title,content,category\nOne,a,Work\nTwo,too long for the limit,Work\n"
+        with self.settings(NOTES_IMPORT_MAX_FIELD_SIZE=10):
+            response = self._post(body, content_type="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data["created"], response.data["failed"]), (1, 1))
+        self.assertIn("Malformed CSV", response.data["errors"][0]["errors"]["detail"][0])
+
+    def test_all_rows_invalid(self):
+        response = self._post('{"title": "x"}\n')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_utf8_is_reported(self):
+        body = b'{"title": "One", "content": "a", "category": "Work"}\n{"title": "\xff"}\n'
+        response = self.client.generic(
+            "POST", "/api/notes/import/", body, content_type="application/x-ndjson"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data["created"], response.data["failed"]), (1, 1))
+        self.assertEqual(response.data["errors"][0]["row"], 2)
+
+        response = self.client.generic("POST", "/api/notes/import/", b"\xff\n", content_type="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_command(self):
+        path = Path(self.enterContext(tempfile.TemporaryDirectory())) / "notes.csv"
+        path.write_text("title,content,category\nHello,World,Work\n", encoding="utf-8")
+        out = StringIO()
+        call_command("import_notes", str(path), "--user", "USER@test.com", stdout=out, stderr=StringIO())
+        self.assertIn("Imported 1 of 1 rows (0 failed)", out.getvalue())
+        self.assertTrue(Note.objects.filter(user=self.user, title="Hello", category=self.work).exists())
+
+
+@override_settings(NOTES_LIST_CACHE_TIMEOUT=60)
+class NoteListCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(email="user@test.com", password="TestPass123!")
+        self.auth = f"Bearer {RefreshToken.for_user(self.user).access_token}"
+        self.client.credentials(HTTP_AUTHORIZATION=self.auth)
+        self.category = Category.objects.create(name="Work")
+        self.note = Note.objects.create(
+            title="Cached", content="Content", user=self.user, category=self.category
+        )
+
+    def test_repeated_list_skips_the_database(self):
+        first = self.client.get("/api/notes/")
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/notes/")
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_cached_page_answers_conditional_requests(self):
+        etag = self.client.get("/api/notes/")["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/notes/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_pages_are_cached_per_url(self):
+        self.client.get("/api/notes/")
+        response = self.client.get(f"/api/notes/?category={self.category.id + 1}")
+        self.assertEqual(response.data["count"], 0)
+
+    def test_note_writes_invalidate(self):
+        self.client.get("/api/notes/")
+        self.client.patch(f"/api/notes/{self.note.id}/", {"title": "Renamed"}, format="json")
+        self.assertEqual(self.client.get("/api/notes/").data["results"][0]["title"], "Renamed")
+
+        self.client.post(
+            "/api/notes/bulk/",
+            [{"title": "Bulk", "content": "c", "category_id": self.category.id}],
+            format="json",
+        )
+        self.assertEqual(self.client.get("/api/notes/").data["count"], 2)
+
+    def test_category_changes_invalidate(self):
+        self.client.get("/api/notes/")
+        self.category.name = "Office"
+        self.category.save()
+        response = self.client.get("/api/notes/")
+        self.assertEqual(response.data["results"][0]["category"]["name"], "Office")
+
+    def test_other_users_are_unaffected(self):
+        other = User.objects.create_user(email="other@test.com", password="TestPass123!")
+        self.client.get("/api/notes/")
+        Note.objects.create(title="Theirs", content="c", user=other)
+        with self.assertNumQueries(0):
+            self.client.get("/api/notes/")
+
+    def test_async_list_shares_the_page_cache(self):
+        note_list = async_to_sync(async_views.note_list)
+        request = AsyncRequestFactory().get("/api/notes/", headers={"Authorization": self.auth})
+        first = note_list(request)
+        with self.assertNumQueries(0):
+            second = note_list(request)
+            synced = self.client.get("/api/notes/")
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertEqual(synced.json(), json.loads(first.content))
+
+    @override_settings(NOTES_LIST_CACHE_TIMEOUT=0)
+    def test_cache_can_be_disabled(self):
+        self.client.get("/api/notes/")
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/notes/")
+        self.assertGreater(len(queries), 0)
+
+
+class NoteRepresentationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email="user@test.com", password="TestPass123!")
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(self.user).access_token}"
+        )
+        work = Category.objects.create(name="Work")
+        home = Category.objects.create(name="Home")
+        for index, category in enumerate([work, home, None, work]):
+            Note.objects.create(
+                title=f"Note {index}", content="Content", category=category, user=self.user
+            )
+        self.notes = Note.objects.filter(user=self.user).select_related("category")
+
+    def test_rows_match_serializer(self):
+        self.assertEqual(
+            represent_notes(note_rows(self.notes)), NoteSerializer(self.notes, many=True).data
+        )
+
+    def test_instance_matches_serializer(self):
+        for note in self.notes:
+            self.assertEqual(represent_note(note), NoteSerializer(note).data)
+
+    @override_settings(TIME_ZONE="America/Lima")
+    def test_matches_serializer_outside_utc(self):
+        self.assertEqual(
+            represent_notes(note_rows(self.notes)), NoteSerializer(self.notes, many=True).data
+        )
+
+    @override_settings(NOTES_LIST_CACHE_TIMEOUT=0)
+    def test_endpoints_match_serializer(self):
+        response = self.client.get("/api/notes/")
+        self.assertEqual(response.json()["results"], NoteSerializer(self.notes, many=True).data)
+
+        response = self.client.get("/api/notes/?pagination=cursor")
+        self.assertEqual(response.json()["results"], NoteSerializer(self.notes, many=True).data)
+
+        note = self.notes[0]
+        response = self.client.get(f"/api/notes/{note.id}/")
+        self.assertEqual(response.json(), NoteSerializer(note).data)
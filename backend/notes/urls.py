@@ -1,6 +1,8 @@
+from django.conf import settings
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from . import async_views
 from .views import NoteViewSet
 
 router = DefaultRouter()
@@ -8,6 +10,17 @@ router.register(r"", NoteViewSet, basename="note")
 
 app_name = "notes"
 
-urlpatterns = [
+urlpatterns = []
+
+# Ahead of the router, whose detail route would otherwise match these paths.
+# The event stream holds its connection open, so it is only served under ASGI.
+if settings.NOTES_ASYNC_VIEWS:
+    urlpatterns += [
+        path("events/", async_views.note_events, name="note-events"),
+        path("", async_views.note_list, name="note-list"),
+        path("<int:pk>/", async_views.note_detail, name="note-detail"),
+    ]
+
+urlpatterns += [
     path("", include(router.urls)),
 ]
@@ -1,26 +1,340 @@
-from drf_spectacular.utils import extend_schema, extend_schema_view
-from rest_framework import permissions, viewsets
+from functools import cached_property
 
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from . import cache as page_cache
+from .bulk import bulk_create_notes, bulk_delete_notes, bulk_update_notes
+from .etags import note_etag, notes_list_etag, notes_page_etag, precondition_failed
+from .exceptions import PreconditionFailed
+from .export import FORMATS, astream_export, stream_export
+from .fieldsets import apply_fieldset, parse_fieldset, parse_preview
+from .filters import NoteFilter
+from .importer import INPUT_FORMATS, decode_lines, import_notes
 from .models import Note
+from .pagination import NoteCursorPagination
 from .permissions import IsOwner
-from .serializers import NoteSerializer
+from .representations import note_rows, represent_note, represent_notes
+from .search import search_notes
+from .serializers import (
+    NoteBulkCreateSerializer,
+    NoteBulkDeleteResponseSerializer,
+    NoteBulkDeleteSerializer,
+    NoteBulkResponseSerializer,
+    NoteBulkUpdateSerializer,
+    NoteImportReportSerializer,
+    NoteSearchSerializer,
+    NoteSerializer,
+    NoteStatsSerializer,
+    NoteSyncSerializer,
+)
+from .sync import InvalidWatermark, changes_since, read_watermark
 
 
 @extend_schema_view(
-    list=extend_schema(summary="List notes", description="Returns the authenticated user's notes (paginated)."),
+    list=extend_schema(
+        summary="List notes",
+        description=(
+            "Returns the authenticated user's notes (paginated). Pass `pagination=cursor` "
+            "(or a `cursor`) for keyset pagination without a total count. Pass `q` for a "
+            "ranked full-text search that adds `rank` and a highlighted `snippet` to each note. "
+            "Use `fields`/`omit` for sparse fieldsets and `preview=true` to truncate `content`."
+        ),
+        parameters=[
+            OpenApiParameter("q", OpenApiTypes.STR, description="Full-text search query."),
+            OpenApiParameter("fields", OpenApiTypes.STR, description="Comma-separated fields to return."),
+            OpenApiParameter("omit", OpenApiTypes.STR, description="Comma-separated fields to leave out."),
+            OpenApiParameter("preview", OpenApiTypes.BOOL, description="Truncate `content` to a preview."),
+        ],
+    ),
     create=extend_schema(summary="Create note", description="Creates a new note for the authenticated user."),
-    retrieve=extend_schema(summary="Get note", description="Returns a note by ID (only if owned by the user)."),
-    partial_update=extend_schema(summary="Update note", description="Partially updates a note (PATCH)."),
-    destroy=extend_schema(summary="Delete note", description="Deletes a note by ID."),
+    retrieve=extend_schema(
+        summary="Get note",
+        description="Returns a note by ID (only if owned by the user). Honors `If-None-Match`.",
+    ),
+    partial_update=extend_schema(
+        summary="Update note",
+        description="Partially updates a note (PATCH). Send `If-Match` to reject lost updates with 412.",
+    ),
+    destroy=extend_schema(
+        summary="Delete note",
+        description="Deletes a note by ID. Send `If-Match` to reject stale deletes with 412.",
+    ),
 )
 @extend_schema(tags=["Notes"])
 class NoteViewSet(viewsets.ModelViewSet):
     serializer_class = NoteSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwner]
     http_method_names = ["get", "post", "patch", "delete", "head", "options"]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = NoteFilter
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator") and self.request is not None:
+            if NoteCursorPagination.is_requested(self.request) and not self.search_query:
+                self._paginator = NoteCursorPagination()
+        return super().paginator
+
+    @property
+    def search_query(self):
+        if getattr(self, "action", None) != "list":
+            return ""
+        return self.request.query_params.get("q", "").strip()
+
+    @cached_property
+    def fieldset(self):
+        if getattr(self, "action", None) != "list":
+            return None
+        return parse_fieldset(self.request.query_params)
+
+    @cached_property
+    def preview(self):
+        return getattr(self, "action", None) == "list" and parse_preview(self.request.query_params)
 
     def get_queryset(self):
-        return Note.objects.filter(user=self.request.user).select_related("category")
+        queryset = Note.objects.filter(user_id=self.request.user.id).select_related("category")
+        if self.fieldset is not None or self.preview:
+            queryset = apply_fieldset(
+                queryset, self.fieldset, self.preview, settings.NOTES_PREVIEW_LENGTH
+            )
+        if self.search_query:
+            queryset = search_notes(queryset, self.search_query)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if self.fieldset is not None or self.preview:
+            kwargs.setdefault("fields", self.fieldset)
+            kwargs.setdefault("preview", self.preview)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_object(self):
+        note = super().get_object()
+        if self.request.method in ("PATCH", "DELETE"):
+            if precondition_failed(self.request, note_etag(note)):
+                raise PreconditionFailed()
+        return note
+
+    def get_serializer_class(self):
+        if self.search_query:
+            return NoteSearchSerializer
+        return super().get_serializer_class()
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.id)
+
+    def list(self, request, *args, **kwargs):
+        cache_key = None
+        if page_cache.get_timeout():
+            cache_key = page_cache.page_key(request.user.id, request.build_absolute_uri())
+            cached = page_cache.get_page(cache_key)
+            if cached is not None:
+                response = get_conditional_response(request, etag=cached["etag"])
+                if response is None:
+                    response = Response(cached["data"])
+                response["ETag"] = cached["etag"]
+                return response
+
+        if isinstance(self.paginator, NoteCursorPagination):
+            # Keyset pages skip COUNT(*); take the ETag from the page's own rows
+            # rather than aggregating over every note of the user.
+            response = self._list_page(request, *args, **kwargs)
+            paginator = self.paginator
+            etag = notes_page_etag(paginator.page, paginator.has_next, paginator.has_previous)
+            response = get_conditional_response(request, etag=etag) or response
+        else:
+            queryset = self.filter_queryset(Note.objects.filter(user_id=request.user.id))
+            etag = notes_list_etag(queryset)
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = self._list_page(request, *args, **kwargs)
+        if cache_key is not None and response.status_code == status.HTTP_200_OK:
+            page_cache.set_page(cache_key, response.data, etag)
+        response["ETag"] = etag
+        return response
+
+    def _list_page(self, request, *args, **kwargs):
+        if self.fieldset is not None or self.preview or self.search_query:
+            return super().list(request, *args, **kwargs)
+        # Default representation: render values() rows without the serializer.
+        rows = note_rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(represent_notes(page))
+        return Response(represent_notes(rows))
+
+    def retrieve(self, request, *args, **kwargs):
+        note = self.get_object()
+        etag = note_etag(note)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = Response(represent_note(note))
+        response["ETag"] = etag
+        return response
+
+    def update(self, request, *args, **kwargs):
+        response = super().update(request, *args, **kwargs)
+        response["ETag"] = note_etag(self.updated_note)
+        return response
+
+    def perform_update(self, serializer):
+        self.updated_note = serializer.save()
+
+    @extend_schema(
+        summary="Note stats",
+        description="Returns the user's note count per category, aggregated in a single query.",
+        responses={200: NoteStatsSerializer},
+    )
+    @action(detail=False, methods=["get"])
+    def stats(self, request):
+        queryset = self.filter_queryset(Note.objects.filter(user_id=request.user.id))
+        rows = queryset.values("category_id").annotate(count=Count("id")).order_by("category_id")
+        categories = [{"category_id": row["category_id"], "count": row["count"]} for row in rows]
+        return Response(
+            {"total": sum(row["count"] for row in categories), "categories": categories}
+        )
+
+    @extend_schema(
+        summary="Export notes",
+        description=(
+            "Streams every note as NDJSON (default) or CSV, honoring the list filters. "
+            "Rows are read in chunks, so exports of any size use constant memory."
+        ),
+        parameters=[
+            OpenApiParameter("output", OpenApiTypes.STR, enum=[*FORMATS], description="Export format.")
+        ],
+        responses={
+            (200, "application/x-ndjson"): OpenApiTypes.STR,
+            (200, "text/csv"): OpenApiTypes.STR,
+        },
+    )
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        # Not ``format``: DRF reserves that query parameter for renderer selection.
+        output = request.query_params.get("output", "ndjson")
+        if output not in FORMATS:
+            raise ValidationError({"output": f"Expected one of: {', '.join(FORMATS)}."})
+
+        queryset = self.filter_queryset(Note.objects.filter(user_id=request.user.id))
+        content_type, extension = FORMATS[output]
+        stream = astream_export if isinstance(request._request, ASGIRequest) else stream_export
+        response = StreamingHttpResponse(
+            stream(queryset, output, settings.NOTES_EXPORT_CHUNK_SIZE),
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = f'attachment; filename="notes.{extension}"'
+        return response
+
+    @extend_schema(
+        summary="Import notes",
+        description=(
+            "Imports notes from an NDJSON or CSV request body (`text/csv` or `?input=csv`), "
+            "parsed line by line and inserted in batches. Rows name their category with "
+            "`category` (name) or `category_id`; invalid rows are reported by row number."
+        ),
+        parameters=[
+            OpenApiParameter("input", OpenApiTypes.STR, enum=[*INPUT_FORMATS], description="Input format.")
+        ],
+        request={"application/x-ndjson": OpenApiTypes.STR, "text/csv": OpenApiTypes.STR},
+        responses={201: NoteImportReportSerializer},
+    )
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_notes(self, request):
+        input_format = request.query_params.get("input")
+        if input_format is None:
+            input_format = "csv" if request.content_type.startswith("text/csv") else "ndjson"
+        if input_format not in INPUT_FORMATS:
+            raise ValidationError({"input": f"Expected one of: {', '.join(INPUT_FORMATS)}."})
+
+        # Read the raw body line by line rather than parsing it whole via request.data.
+        lines = decode_lines(request.stream or ())
+        report = import_notes(request.user.id, lines, input_format)
+        return Response(
+            report,
+            status=status.HTTP_201_CREATED
+            if report["created"] or not report["failed"]
+            else status.HTTP_400_BAD_REQUEST,
+        )
+
+    @extend_schema(
+        summary="Sync notes",
+        description=(
+            "Returns notes created or updated since `watermark`, plus the IDs of notes deleted "
+            "since then, and a new watermark for the next call. Omit `watermark` for a full sync; "
+            "watermarks older than the tombstone retention also get one (`full` is true)."
+        ),
+        parameters=[
+            OpenApiParameter("watermark", OpenApiTypes.STR, description="Watermark from the previous sync.")
+        ],
+        responses={200: NoteSyncSerializer},
+    )
+    @action(detail=False, methods=["get"])
+    def sync(self, request):
+        token = request.query_params.get("watermark")
+        try:
+            since = read_watermark(token) if token else None
+        except InvalidWatermark:
+            raise ValidationError({"watermark": "Invalid watermark."})
+
+        watermark, full, notes, deleted = changes_since(request.user.id, since)
+        return Response(
+            {
+                "watermark": watermark,
+                "full": full,
+                "notes": NoteSerializer(notes, many=True).data,
+                "deleted": deleted,
+            }
+        )
+
+    @extend_schema(
+        methods=["POST"],
+        summary="Bulk create notes",
+        description="Creates many notes in one transaction. Invalid items are reported by index.",
+        request=NoteBulkCreateSerializer(many=True),
+        responses={201: NoteBulkResponseSerializer},
+    )
+    @extend_schema(
+        methods=["PATCH"],
+        summary="Bulk update notes",
+        description="Partially updates many notes (each item needs an `id`) in one transaction.",
+        request=NoteBulkUpdateSerializer(many=True),
+        responses={200: NoteBulkResponseSerializer},
+    )
+    @extend_schema(
+        methods=["DELETE"],
+        summary="Bulk delete notes",
+        description="Deletes the notes whose IDs are listed in `ids`.",
+        request=NoteBulkDeleteSerializer,
+        responses={200: NoteBulkDeleteResponseSerializer},
+    )
+    @action(detail=False, methods=["post", "patch", "delete"])
+    def bulk(self, request):
+        if request.method == "DELETE":
+            serializer = NoteBulkDeleteSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            deleted, errors = bulk_delete_notes(request.user.id, serializer.validated_data["ids"])
+            return Response(
+                {"deleted": deleted, "errors": errors},
+                status=status.HTTP_200_OK if deleted else status.HTTP_400_BAD_REQUEST,
+            )
+
+        if request.method == "POST":
+            notes, errors = bulk_create_notes(request.user.id, request.data)
+            success = status.HTTP_201_CREATED
+        else:
+            notes, errors = bulk_update_notes(request.user.id, request.data)
+            success = status.HTTP_200_OK
+        return Response(
+            {"results": NoteSerializer(notes, many=True).data, "errors": errors},
+            status=success if notes or not errors else status.HTTP_400_BAD_REQUEST,
+        )
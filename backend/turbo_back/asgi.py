@@ -12,5 +12,14 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "turbo_back.settings")
+# Under ASGI, serve the async views: login/register hash passwords on a bounded
+# pool (accounts.async_views) and the core note endpoints use the async ORM
+# (notes.async_views).
+os.environ.setdefault("ACCOUNTS_ASYNC_AUTH_VIEWS", "1")
+os.environ.setdefault("NOTES_ASYNC_VIEWS", "1")
+# Persistent connections are not reused under ASGI, where each request may run
+# on a different thread, so close them after every request; set DB_POOL=1 to
+# reuse PostgreSQL connections through psycopg's pool instead.
+os.environ.setdefault("DB_CONN_MAX_AGE", "0")
 
 application = get_asgi_application()
@@ -0,0 +1,79 @@
+"""
+Environment-driven cache backends, and the invalidation helper shared by the
+app caches.
+
+``CACHE_BACKEND`` selects ``locmem`` (the default; per process), ``file``
+(shared by the processes of one host) or ``redis`` (shared by every host),
+which speaks to any Redis-protocol server such as Redis, Valkey or KeyDB.
+"""
+
+import os
+from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+
+
+def cache_config(base_dir, env=os.environ) -> dict:
+    backend = env.get("CACHE_BACKEND", "locmem")
+    timeout = int(env.get("CACHE_TIMEOUT", 300))
+    if backend == "locmem":
+        return {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "turbo-back",
+            "TIMEOUT": timeout,
+            "OPTIONS": {"MAX_ENTRIES": int(env.get("CACHE_MAX_ENTRIES", 5000))},
+        }
+    if backend == "file":
+        return {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": env.get("CACHE_LOCATION") or base_dir / ".django_cache",
+            "TIMEOUT": timeout,
+            "OPTIONS": {"MAX_ENTRIES": int(env.get("CACHE_MAX_ENTRIES", 5000))},
+        }
+    if backend == "redis":
+        # Requires the redis package.
+        return {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": env.get("CACHE_LOCATION", "redis://127.0.0.1:6379/0"),
+            "TIMEOUT": timeout,
+            "KEY_PREFIX": env.get("CACHE_KEY_PREFIX", "turbo-back"),
+        }
+    raise ImproperlyConfigured(
+        f"Unknown CACHE_BACKEND {backend!r}; expected 'locmem', 'file' or 'redis'."
+    )
+
+
+def denylist_cache_config(base_dir, env=os.environ, debug=False) -> dict:
+    """
+    Cache for revoked refresh tokens: same backend as the default cache but
+    kept apart from it, so page caching can never evict a revocation. Entries
+    carry their own timeout. Outside DEBUG it must be shared by every worker,
+    so locmem is refused. Redis must run with ``maxmemory-policy noeviction``.
+    """
+    backend = env.get("CACHE_BACKEND", "locmem")
+    if backend == "locmem" and not debug:
+        raise ImproperlyConfigured(
+            "The token denylist needs a shared cache outside DEBUG; "
+            "set CACHE_BACKEND to 'file' or 'redis'."
+        )
+    config = cache_config(base_dir, env)
+    config["TIMEOUT"] = None
+    if backend == "redis":
+        config["KEY_PREFIX"] = env.get("CACHE_KEY_PREFIX", "turbo-back") + "-denylist"
+    else:
+        # locmem and file caches cull at MAX_ENTRIES; never reach it.
+        config["OPTIONS"] = {"MAX_ENTRIES": 2**62}
+        config["LOCATION"] = (
+            "turbo-back-denylist" if backend == "locmem" else Path(config["LOCATION"]) / "denylist"
+        )
+    return config
+
+
+def bump_now_and_on_commit(bump) -> None:
+    """
+    Call ``bump()`` now and again once the current transaction commits, in
+    case a concurrent request cached the old rows before they became visible.
+    """
+    bump()
+    transaction.on_commit(bump)
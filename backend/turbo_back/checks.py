@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+CSRF_MIDDLEWARE = (
+    "turbo_back.middleware.CsrfViewMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+)
+
+
+@register(Tags.security, deploy=True)
+def check_csrf_middleware(app_configs=None, **kwargs):
+    """
+    Stand-in for Django's ``security.W003``, which is silenced because it only
+    recognises ``django.middleware.csrf.CsrfViewMiddleware`` by its exact path.
+    """
+    if any(path in settings.MIDDLEWARE for path in CSRF_MIDDLEWARE):
+        return []
+    return [
+        Warning(
+            "You don't appear to be using a CSRF middleware in MIDDLEWARE, so the "
+            "admin and other session-authenticated views are not protected against "
+            "cross-site request forgery.",
+            hint=f"Add '{CSRF_MIDDLEWARE[0]}' to MIDDLEWARE.",
+            id="turbo_back.W001",
+        )
+    ]
@@ -0,0 +1,113 @@
+"""
+Content codings for ``CompressionMiddleware``.
+
+gzip is always available; ``br`` needs the brotli package and ``zstd`` either
+Python 3.14's ``compression.zstd`` or the zstandard package. Every codec
+exposes the ``compress(data)`` / ``flush()`` interface of ``zlib`` compress
+objects, so one-shot and streaming bodies are encoded the same way.
+"""
+
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from compression import zstd
+except ImportError:
+    zstd = None
+    try:
+        import zstandard
+    except ImportError:
+        zstandard = None
+
+
+def _gzip(level):
+    # wbits=31: deflate with a gzip header and trailer.
+    return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+class _BrotliCompressor:
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.finish()
+
+
+def _zstd(level):
+    if zstd is not None:
+        return zstd.ZstdCompressor(level=level)
+    return zstandard.ZstdCompressor(level=level).compressobj()
+
+
+CODECS = {"gzip": _gzip}
+if brotli is not None:
+    CODECS["br"] = _BrotliCompressor
+if zstd is not None or zstandard is not None:
+    CODECS["zstd"] = _zstd
+
+DEFAULT_LEVELS = {"gzip": 6, "br": 4, "zstd": 3}
+
+
+def new_compressor(encoding, level=None):
+    return CODECS[encoding](DEFAULT_LEVELS[encoding] if level is None else level)
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """Map each coding in an ``Accept-Encoding`` header to its q-value."""
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def negotiate(header: str, encodings) -> str | None:
+    """
+    Pick the coding to use for a request's ``Accept-Encoding`` header: the
+    highest q-value among the available ``encodings``, ties going to the
+    earlier one. None means the body is sent unencoded.
+    """
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        if encoding not in CODECS:
+            continue
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress_stream(compressor, chunks):
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def acompress_stream(compressor, chunks):
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
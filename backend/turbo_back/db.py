@@ -0,0 +1,87 @@
+"""
+Environment-driven database profiles.
+
+``DB_PROFILE=sqlite`` (the default) is a tuned single-node SQLite setup;
+``DB_PROFILE=postgres`` connects to PostgreSQL with either persistent
+connections or, with ``DB_POOL=1``, psycopg's connection pool. Persistent
+connections only help WSGI workers; ``turbo_back.asgi`` turns them off, so
+ASGI deployments reuse connections through the pool.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.signals import connection_created
+
+# Applied to every new SQLite connection. WAL lets readers run alongside the
+# single writer. The busy timeout is left to the "timeout" option (seconds,
+# from SQLITE_TIMEOUT): a busy_timeout pragma here would silently override it.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -20000,
+    "temp_store": "MEMORY",
+}
+
+
+def _env_int(env, name, default):
+    value = env.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+def sqlite_config(env, base_dir) -> dict:
+    return {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": env.get("SQLITE_PATH") or base_dir / "db.sqlite3",
+        "OPTIONS": {
+            # Take the write lock when the transaction starts, so concurrent
+            # writers wait out the timeout instead of deadlocking on upgrade.
+            "transaction_mode": "IMMEDIATE",
+            "timeout": _env_int(env, "SQLITE_TIMEOUT", 20),
+        },
+    }
+
+
+def postgres_config(env) -> dict:
+    config = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": env.get("POSTGRES_DB", "notes"),
+        "USER": env.get("POSTGRES_USER", "notes"),
+        "PASSWORD": env.get("POSTGRES_PASSWORD", ""),
+        "HOST": env.get("POSTGRES_HOST", "localhost"),
+        "PORT": env.get("POSTGRES_PORT", "5432"),
+        "OPTIONS": {},
+    }
+    if env.get("DB_POOL", "0") == "1":
+        # Requires psycopg[pool]. Django refuses pooling together with
+        # persistent connections, so CONN_MAX_AGE stays 0.
+        config["OPTIONS"]["pool"] = {
+            "min_size": _env_int(env, "DB_POOL_MIN_SIZE", 2),
+            "max_size": _env_int(env, "DB_POOL_MAX_SIZE", 10),
+            "timeout": _env_int(env, "DB_POOL_TIMEOUT", 10),
+        }
+    else:
+        config["CONN_MAX_AGE"] = _env_int(env, "DB_CONN_MAX_AGE", 60)
+        config["CONN_HEALTH_CHECKS"] = True
+    return config
+
+
+def database_config(base_dir, env=os.environ) -> dict:
+    profile = env.get("DB_PROFILE", "sqlite")
+    if profile == "sqlite":
+        return sqlite_config(env, base_dir)
+    if profile == "postgres":
+        return postgres_config(env)
+    raise ImproperlyConfigured(f"Unknown DB_PROFILE {profile!r}; expected 'sqlite' or 'postgres'.")
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+
+
+connection_created.connect(apply_sqlite_pragmas, dispatch_uid="turbo_back.db.sqlite_pragmas")
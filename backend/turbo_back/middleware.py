@@ -0,0 +1,118 @@
+from django.conf import settings
+from django.contrib.auth import middleware as auth
+from django.contrib.messages import middleware as messages
+from django.contrib.sessions import middleware as sessions
+from django.middleware import csrf
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from .compression import acompress_stream, compress_stream, negotiate, new_compressor
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "application/vnd.oai.openapi",
+    "image/svg+xml",
+}
+
+
+def _compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type == "text/event-stream":
+        # Events must reach the client as soon as they are written.
+        return False
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith(("+json", "+xml"))
+    )
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress responses with the best coding the client accepts (zstd, br or
+    gzip, per ``COMPRESSION["ENCODINGS"]``) at ``COMPRESSION["LEVELS"]``.
+
+    Bodies shorter than ``COMPRESSION["MIN_SIZE"]`` bytes, bodiless responses
+    (204, 304), Server-Sent Events and ``Cache-Control: no-transform``
+    responses are left alone. Streaming responses, such as exports, are
+    compressed chunk by chunk as they are sent. A compressed body is no longer
+    byte-for-byte the one its ETag named, so the ETag is weakened; the note
+    views compare ``If-Match`` weakly to accept it back.
+    """
+
+    def process_response(self, request, response):
+        if (
+            response.status_code in (204, 206, 304)
+            or response.has_header("Content-Encoding")
+            or "no-transform" in response.get("Cache-Control", "")
+            or not _compressible(response.get("Content-Type", ""))
+        ):
+            return response
+
+        config = settings.COMPRESSION
+        if not response.streaming:
+            content = response.content
+            if len(content) < config.get("MIN_SIZE", 0):
+                return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate(request.headers.get("Accept-Encoding", ""), config["ENCODINGS"])
+        if encoding is None:
+            return response
+
+        compressor = new_compressor(encoding, config.get("LEVELS", {}).get(encoding))
+        if response.streaming:
+            stream = acompress_stream if response.is_async else compress_stream
+            response.streaming_content = stream(compressor, response.streaming_content)
+            del response["Content-Length"]
+        else:
+            compressed = compressor.compress(content) + compressor.flush()
+            if len(compressed) >= len(content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+        etag = response.get("ETag")
+        if etag and not etag.startswith("W/"):
+            response["ETag"] = f"W/{etag}"
+        return response
+
+
+def is_api_request(request) -> bool:
+    return settings.API_SLIM_MIDDLEWARE and request.path_info.startswith(settings.API_PATH_PREFIX)
+
+
+class APIExemptMixin:
+    """
+    Bypass the middleware for API requests when ``API_SLIM_MIDDLEWARE`` is on.
+    API views authenticate with JWT bearer tokens, so sessions, cookies, CSRF
+    tokens and messages are pure overhead there.
+    """
+
+    def __call__(self, request):
+        if is_api_request(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class SessionMiddleware(APIExemptMixin, sessions.SessionMiddleware):
+    pass
+
+
+class CsrfViewMiddleware(APIExemptMixin, csrf.CsrfViewMiddleware):
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        # View hooks are called by the handler directly, not through __call__.
+        if is_api_request(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class AuthenticationMiddleware(APIExemptMixin, auth.AuthenticationMiddleware):
+    pass
+
+
+class MessageMiddleware(APIExemptMixin, messages.MessageMiddleware):
+    pass
@@ -0,0 +1,35 @@
+"""
+JSON parsing on orjson, falling back to DRF's stdlib parser.
+
+orjson is optional (``pip install orjson``); without it ``FastJSONParser``
+behaves exactly like ``rest_framework.parsers.JSONParser``.
+"""
+
+import codecs
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from .renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(JSONParser):
+    """
+    Drop-in ``JSONParser`` that decodes UTF-8 bodies with orjson. orjson
+    rejects ``NaN`` and ``Infinity`` like ``STRICT_JSON`` does, so non-strict
+    parsing uses the stdlib path.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
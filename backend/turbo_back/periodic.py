@@ -0,0 +1,56 @@
+"""
+Background maintenance jobs run every N seconds on a daemon thread in each
+process, for deployments without an external scheduler.
+"""
+
+import logging
+import threading
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+_runners: dict[str, tuple[threading.Thread, threading.Event]] = {}
+_lock = threading.Lock()
+
+
+def _run_periodically(name: str, interval: float, job, stop: threading.Event) -> None:
+    while not stop.wait(interval):
+        try:
+            job()
+        except Exception:
+            logger.exception("Periodic job %s failed", name)
+        finally:
+            close_old_connections()
+
+
+def start(name: str, interval: float | None, job) -> threading.Event | None:
+    """
+    Call ``job()`` every ``interval`` seconds on a daemon thread called
+    ``name``; a falsy ``interval`` disables it and returns None. Returns the
+    running thread's stop event (the same one if ``name`` is already running).
+    """
+    if not interval:
+        return None
+    with _lock:
+        runner = _runners.get(name)
+        if runner is None or not runner[0].is_alive():
+            stop_event = threading.Event()
+            thread = threading.Thread(
+                target=_run_periodically,
+                args=(name, interval, job, stop_event),
+                name=name,
+                daemon=True,
+            )
+            thread.start()
+            runner = _runners[name] = (thread, stop_event)
+    return runner[1]
+
+
+def stop(name: str, timeout: float | None = None) -> None:
+    """Stop the ``name`` thread, if running, and wait for it to exit."""
+    with _lock:
+        runner = _runners.pop(name, None)
+    if runner is not None:
+        runner[1].set()
+        runner[0].join(timeout)
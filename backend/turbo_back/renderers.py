@@ -0,0 +1,59 @@
+"""
+JSON rendering on orjson, falling back to DRF's stdlib renderer.
+
+orjson is optional (``pip install orjson``); without it ``FastJSONRenderer``
+behaves exactly like ``rest_framework.renderers.JSONRenderer``.
+"""
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson never escapes these, but DRF does so the output stays a JavaScript subset.
+_LINE_SEPARATORS = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029"))
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Drop-in ``JSONRenderer`` that encodes with orjson when it is installed.
+
+    orjson writes datetimes, dates, times and UUIDs itself (UTC as ``Z``, as
+    DRF does); anything else it cannot encode (Decimals, lazy strings,
+    timedeltas, querysets...) goes through DRF's ``JSONEncoder.default``.
+    Output is always compact UTF-8, so indented or ASCII-only responses
+    (the browsable API, ``UNICODE_JSON = False``...) use the stdlib path, as
+    does ``STRICT_JSON = False``. Where ``STRICT_JSON`` would raise on NaN and
+    infinities, orjson renders them as ``null``.
+    """
+
+    encoder_class = JSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits, which the stdlib encoder handles.
+            return super().render(data, accepted_media_type, renderer_context)
+        for raw, escaped in _LINE_SEPARATORS:
+            if raw in ret:
+                ret = ret.replace(raw, escaped)
+        return ret
@@ -14,6 +14,11 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
+from turbo_back.caches import cache_config, denylist_cache_config
+from turbo_back.db import database_config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -57,15 +62,29 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "turbo_back.middleware.CompressionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    "turbo_back.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
+    "turbo_back.middleware.CsrfViewMiddleware",
+    "turbo_back.middleware.AuthenticationMiddleware",
+    "turbo_back.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# API-only mode: the session, CSRF, authentication and message middleware above
+# skip requests under API_PATH_PREFIX, which authenticate with JWT bearer tokens
+# only. Everything else (the admin) keeps the full stack.
+API_SLIM_MIDDLEWARE = os.environ.get("API_SLIM_MIDDLEWARE", "1") == "1"
+API_PATH_PREFIX = "/api/"
+
+SILENCED_SYSTEM_CHECKS = [
+    # security.W003 looks for django.middleware.csrf.CsrfViewMiddleware by its
+    # exact path, so it misses turbo_back.middleware.CsrfViewMiddleware above.
+    # turbo_back.W001 (turbo_back/checks.py) makes the same check for either.
+    "security.W003",
+]
+
 ROOT_URLCONF = "turbo_back.urls"
 
 TEMPLATES = [
@@ -88,12 +107,20 @@ WSGI_APPLICATION = "turbo_back.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
+# Chosen with DB_PROFILE ("sqlite" or "postgres"); see turbo_back/db.py.
 
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+    "default": database_config(BASE_DIR),
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Chosen with CACHE_BACKEND ("locmem", "file" or "redis"); see turbo_back/caches.py.
+
+CACHES = {
+    "default": cache_config(BASE_DIR),
+    "token-denylist": denylist_cache_config(BASE_DIR, debug=DEBUG),
 }
 
 
@@ -116,6 +143,43 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# Pick the preferred hasher with ACCOUNTS_PASSWORD_HASHER ("scrypt", "argon2" or
+# "pbkdf2"; argon2 requires argon2-cffi) and size the costs with
+# `manage.py benchmark_password_hashers`. The other hashers stay listed so
+# existing hashes still verify; they are upgraded on the user's next login.
+
+_PASSWORD_HASHER_PROFILES = {
+    "scrypt": "accounts.hashers.TunedScryptPasswordHasher",
+    "argon2": "accounts.hashers.TunedArgon2PasswordHasher",
+    "pbkdf2": "accounts.hashers.TunedPBKDF2PasswordHasher",
+}
+_hasher_profile = os.environ.get("ACCOUNTS_PASSWORD_HASHER", "scrypt")
+if _hasher_profile not in _PASSWORD_HASHER_PROFILES:
+    raise ImproperlyConfigured(
+        f"Unknown ACCOUNTS_PASSWORD_HASHER {_hasher_profile!r}; "
+        "expected 'scrypt', 'argon2' or 'pbkdf2'."
+    )
+_preferred_hasher = _PASSWORD_HASHER_PROFILES[_hasher_profile]
+
+PASSWORD_HASHERS = [
+    _preferred_hasher,
+    *(hasher for hasher in _PASSWORD_HASHER_PROFILES.values() if hasher != _preferred_hasher),
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+
+# Unset values fall back to Django's defaults for that hasher.
+ACCOUNTS_PASSWORD_HASHING = {
+    "PBKDF2_ITERATIONS": None,
+    "SCRYPT_WORK_FACTOR": 2**14,
+    "SCRYPT_BLOCK_SIZE": 8,
+    "SCRYPT_PARALLELISM": 1,
+    "ARGON2_TIME_COST": None,
+    "ARGON2_MEMORY_COST": None,
+    "ARGON2_PARALLELISM": None,
+}
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/6.0/topics/i18n/
 
@@ -138,19 +202,30 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Custom User Model
 AUTH_USER_MODEL = "accounts.User"
 
+# EmailBackend subclasses ModelBackend (permissions) and also handles the
+# admin's ``username`` login, so failed logins hash only once.
 AUTHENTICATION_BACKENDS = [
     "accounts.backends.EmailBackend",
-    "django.contrib.auth.backends.ModelBackend",
 ]
 
 # REST Framework
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.StatelessJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # orjson-backed when orjson is installed, stdlib json otherwise.
+    "DEFAULT_RENDERER_CLASSES": [
+        "turbo_back.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "turbo_back.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 100,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
@@ -184,6 +259,21 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
     "USER_ID_FIELD": "id",
     "USER_ID_CLAIM": "user_id",
+    "TOKEN_USER_CLASS": "accounts.authentication.TokenUser",
+}
+
+# Seconds the API trusts a cached "user is active" answer before re-checking the
+# database. None disables the check (tokens alone authenticate the request).
+ACCOUNTS_ACTIVE_CHECK_TTL = 60
+
+# Response compression (turbo_back.middleware.CompressionMiddleware). The first of
+# ENCODINGS the client accepts is used; "br" needs brotli and "zstd" needs
+# zstandard (or Python 3.14+), and are skipped when missing. Bodies under
+# MIN_SIZE bytes are sent uncompressed.
+COMPRESSION = {
+    "ENCODINGS": ["zstd", "br", "gzip"],
+    "LEVELS": {"zstd": 3, "br": 4, "gzip": 6},
+    "MIN_SIZE": 1024,
 }
 
 # CORS
@@ -193,3 +283,102 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 CORS_ALLOW_CREDENTIALS = True
+
+# Notes list pagination: "page" (page numbers + count) or "cursor" (keyset on created_at, id).
+# Clients can opt in per request with ?pagination=cursor.
+NOTES_PAGINATION = os.environ.get("NOTES_PAGINATION", "page")
+
+# Seconds a cached /api/notes/ list page lives (0 disables the page cache).
+# Pages are keyed by a per-user generation that every note write bumps. That
+# counter must be shared by every worker, so the cache is off with locmem.
+NOTES_LIST_CACHE_TIMEOUT = 60 if os.environ.get("CACHE_BACKEND", "locmem") in ("file", "redis") else 0
+
+# Seconds a cached category list lives before it is rebuilt, bounding staleness
+# when several processes each keep a local cache.
+CATEGORIES_CACHE_TIMEOUT = 300
+
+# Seconds subtracted from a sync watermark so notes committed late by slow
+# transactions are still picked up by the next delta sync.
+NOTES_SYNC_OVERLAP = 5
+
+# Days a deleted note's tombstone is kept for delta sync. Older tombstones are
+# pruned, and sync watermarks older than this get a full sync instead. Prune
+# every N seconds from a background thread in each process (None disables it;
+# use `manage.py prune_note_tombstones` from a scheduler instead).
+NOTES_TOMBSTONE_RETENTION_DAYS = 30
+NOTES_TOMBSTONE_PRUNE_INTERVAL = None
+NOTES_TOMBSTONE_PRUNE_CHUNK_SIZE = 1000
+
+# Serve the core note endpoints from notes.async_views (turbo_back.asgi turns this on).
+NOTES_ASYNC_VIEWS = os.environ.get("NOTES_ASYNC_VIEWS", "0") == "1"
+
+# Broker behind the /api/notes/events/ stream (ASGI only; nothing is published
+# with NOTES_ASYNC_VIEWS off). MemoryBroker is process-local: each worker only
+# streams changes it made itself. history_size events of each of the max_users
+# most recently active users are kept for Last-Event-ID resume; KEEPALIVE is in
+# seconds and RETRY (the client reconnect delay) in milliseconds.
+NOTES_EVENTS = {
+    "BACKEND": "notes.events.MemoryBroker",
+    "OPTIONS": {"history_size": 100, "queue_size": 1000, "max_users": 10_000},
+    "KEEPALIVE": 15,
+    "RETRY": 3000,
+}
+
+# Maximum number of notes accepted by a single /api/notes/bulk/ request.
+NOTES_BULK_MAX_ITEMS = 500
+
+# Rows fetched per database round trip by /api/notes/export/.
+NOTES_EXPORT_CHUNK_SIZE = 2000
+
+# Rows inserted per bulk_create/transaction by note imports, and how many
+# failed rows an import report lists.
+NOTES_IMPORT_BATCH_SIZE = 500
+NOTES_IMPORT_MAX_ERRORS = 1000
+
+# Largest CSV field (in characters) a note import accepts.
+NOTES_IMPORT_MAX_FIELD_SIZE = 16 * 1024 * 1024
+
+# Characters of content returned per note by list requests with ?preview=true.
+NOTES_PREVIEW_LENGTH = 200
+
+# Revoked refresh tokens are looked up in this denylist (keyed by jti), on its own
+# non-evicting cache alias. A store that may evict (may_evict) falls back to the
+# BlacklistedToken table when it has no entry. WARM_FROM_AUDIT_LOG reloads
+# revocations made before the process started into a process-local store
+# (MemoryDenylist); shared stores are never warmed.
+ACCOUNTS_TOKEN_DENYLIST = {
+    "BACKEND": "accounts.denylist.CacheDenylist",
+    "OPTIONS": {
+        "alias": "token-denylist",
+        # The locmem and file aliases never cull. Set to False for a Redis
+        # running with maxmemory-policy noeviction as well.
+        "may_evict": os.environ.get("CACHE_BACKEND", "locmem") == "redis",
+    },
+    "WARM_FROM_AUDIT_LOG": False,
+}
+
+# Issued (outstanding) and revoked tokens are written to the token_blacklist
+# tables in batches, after a response is sent, once BATCH_SIZE rows are buffered
+# or FLUSH_INTERVAL seconds have passed. This is best effort: an idle process
+# writes nothing, and rows still buffered at exit (or whose write fails) are
+# dropped. The denylist keeps answering for revocations.
+ACCOUNTS_TOKEN_AUDIT_LOG = {
+    "BATCH_SIZE": 100,
+    "FLUSH_INTERVAL": 30,
+}
+
+# Prune expired outstanding/blacklisted tokens every N seconds from a background
+# thread in each process (None disables it; use `manage.py prune_expired_tokens`
+# from a scheduler instead).
+ACCOUNTS_TOKEN_PRUNE_INTERVAL = None
+ACCOUNTS_TOKEN_PRUNE_CHUNK_SIZE = 1000
+
+# Serve register/login from accounts.async_views, hashing on a bounded thread
+# pool (turbo_back.asgi turns this on). When all WORKERS are busy and QUEUE_SIZE
+# requests are already waiting, further requests get 503 with Retry-After.
+ACCOUNTS_ASYNC_AUTH_VIEWS = os.environ.get("ACCOUNTS_ASYNC_AUTH_VIEWS", "0") == "1"
+ACCOUNTS_HASHING_POOL = {
+    "WORKERS": int(os.environ.get("ACCOUNTS_HASHING_WORKERS", os.cpu_count() or 1)),
+    "QUEUE_SIZE": int(os.environ.get("ACCOUNTS_HASHING_QUEUE_SIZE", 32)),
+    "RETRY_AFTER": 1,
+}
@@ -0,0 +1,284 @@
+import asyncio
+import datetime
+import gzip
+import io
+import threading
+import uuid
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from .caches import cache_config, denylist_cache_config
+from . import periodic
+from .checks import check_csrf_middleware
+from .compression import CODECS, negotiate
+from .db import database_config
+from .middleware import CompressionMiddleware
+from .parsers import FastJSONParser
+from .renderers import FastJSONRenderer, orjson
+
+
+class DatabaseProfileTest(SimpleTestCase):
+    def test_sqlite_is_the_default(self):
+        config = database_config(Path("/srv"), env={})
+        self.assertEqual(config["ENGINE"], "django.db.backends.sqlite3")
+        self.assertEqual(config["NAME"], Path("/srv/db.sqlite3"))
+        self.assertEqual(config["OPTIONS"]["transaction_mode"], "IMMEDIATE")
+
+    def test_postgres_persistent_connections(self):
+        config = database_config(Path("/srv"), env={"DB_PROFILE": "postgres", "DB_CONN_MAX_AGE": "300"})
+        self.assertEqual(config["ENGINE"], "django.db.backends.postgresql")
+        self.assertEqual(config["CONN_MAX_AGE"], 300)
+        self.assertTrue(config["CONN_HEALTH_CHECKS"])
+        self.assertNotIn("pool", config["OPTIONS"])
+
+    def test_postgres_pool_disables_persistent_connections(self):
+        config = database_config(
+            Path("/srv"), env={"DB_PROFILE": "postgres", "DB_POOL": "1", "DB_POOL_MAX_SIZE": "20"}
+        )
+        self.assertEqual(config["OPTIONS"]["pool"]["max_size"], 20)
+        self.assertNotIn("CONN_MAX_AGE", config)
+
+    def test_unknown_profile(self):
+        with self.assertRaises(ImproperlyConfigured):
+            database_config(Path("/srv"), env={"DB_PROFILE": "oracle"})
+
+
+class CacheConfigTest(SimpleTestCase):
+    def test_locmem_is_the_default(self):
+        config = cache_config(Path("/srv"), env={})
+        self.assertEqual(config["BACKEND"], "django.core.cache.backends.locmem.LocMemCache")
+
+    def test_file_cache_lives_under_base_dir(self):
+        config = cache_config(Path("/srv"), env={"CACHE_BACKEND": "file", "CACHE_MAX_ENTRIES": "100"})
+        self.assertEqual(config["LOCATION"], Path("/srv/.django_cache"))
+        self.assertEqual(config["OPTIONS"]["MAX_ENTRIES"], 100)
+
+    def test_redis_location(self):
+        config = cache_config(
+            Path("/srv"), env={"CACHE_BACKEND": "redis", "CACHE_LOCATION": "redis://cache:6379/1"}
+        )
+        self.assertEqual(config["BACKEND"], "django.core.cache.backends.redis.RedisCache")
+        self.assertEqual(config["LOCATION"], "redis://cache:6379/1")
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ImproperlyConfigured):
+            cache_config(Path("/srv"), env={"CACHE_BACKEND": "memcached"})
+
+    def test_denylist_cache_never_culls(self):
+        config = denylist_cache_config(Path("/srv"), env={"CACHE_BACKEND": "file"})
+        self.assertEqual(config["LOCATION"], Path("/srv/.django_cache/denylist"))
+        self.assertIsNone(config["TIMEOUT"])
+        self.assertGreater(config["OPTIONS"]["MAX_ENTRIES"], 2**32)
+
+    def test_denylist_cache_has_own_redis_prefix(self):
+        config = denylist_cache_config(Path("/srv"), env={"CACHE_BACKEND": "redis"})
+        self.assertEqual(config["KEY_PREFIX"], "turbo-back-denylist")
+
+    def test_denylist_cache_refuses_locmem_outside_debug(self):
+        with self.assertRaises(ImproperlyConfigured):
+            denylist_cache_config(Path("/srv"), env={})
+        config = denylist_cache_config(Path("/srv"), env={}, debug=True)
+        self.assertEqual(config["LOCATION"], "turbo-back-denylist")
+
+
+class DeployCheckTest(SimpleTestCase):
+    def test_csrf_middleware_subclass_is_accepted(self):
+        out, err = io.StringIO(), io.StringIO()
+        call_command("check", "--deploy", stdout=out, stderr=err)
+        self.assertNotIn("security.W003", out.getvalue() + err.getvalue())
+
+    def test_missing_csrf_middleware_is_reported(self):
+        self.assertEqual(check_csrf_middleware(), [])
+        middleware = [path for path in settings.MIDDLEWARE if "Csrf" not in path]
+        with override_settings(MIDDLEWARE=middleware):
+            self.assertEqual([e.id for e in check_csrf_middleware()], ["turbo_back.W001"])
+            out, err = io.StringIO(), io.StringIO()
+            call_command("check", "--deploy", stdout=out, stderr=err)
+            self.assertIn("turbo_back.W001", out.getvalue() + err.getvalue())
+
+
+class SqlitePragmaTest(TestCase):
+    def test_pragmas_applied_on_connect(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite only")
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA busy_timeout")
+            # Governed by SQLITE_TIMEOUT, not overridden by a pragma.
+            self.assertEqual(cursor.fetchone()[0], connection.settings_dict["OPTIONS"]["timeout"] * 1000)
+            cursor.execute("PRAGMA synchronous")
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+
+
+class FastJSONTest(SimpleTestCase):
+    data = {
+        "created_at": datetime.datetime(2024, 5, 1, 12, 30, 5, 120, tzinfo=datetime.UTC),
+        "offset": datetime.datetime(2024, 5, 1, 7, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=-5))),
+        "day": datetime.date(2024, 5, 1),
+        "price": Decimal("12.50"),
+        "uuid": uuid.UUID(int=1),
+        "lazy": gettext_lazy("Not found."),
+        "elapsed": datetime.timedelta(seconds=90),
+        "text": "caf\u00e9 \u2028 line",
+        "ids": (1, 2),
+        1: None,
+    }
+
+    def setUp(self):
+        if orjson is None:
+            self.skipTest("orjson is not installed")
+
+    def test_renders_like_drf(self):
+        self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_indented_output_uses_stdlib(self):
+        rendered = FastJSONRenderer().render(self.data, "application/json; indent=2")
+        self.assertEqual(rendered, JSONRenderer().render(self.data, "application/json; indent=2"))
+
+    def test_falls_back_without_orjson(self):
+        with patch("turbo_back.renderers.orjson", None):
+            self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_parses_like_drf(self):
+        body = '{"title": "caf\u00e9", "ids": [1, 2.5, null], "nested": {"ok": true}}'.encode()
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body))
+        )
+
+    def test_parse_errors(self):
+        for body in (b"{not json", b'{"value": NaN}'):
+            with self.subTest(body=body), self.assertRaises(ParseError):
+                FastJSONParser().parse(io.BytesIO(body))
+
+
+@override_settings(COMPRESSION={"ENCODINGS": ["br", "gzip"], "LEVELS": {"gzip": 5}, "MIN_SIZE": 100})
+class CompressionMiddlewareTest(SimpleTestCase):
+    body = b'{"content": "' + b"lorem ipsum " * 200 + b'"}'
+
+    def _process(self, response, accept_encoding="gzip"):
+        request = RequestFactory().get("/api/notes/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_negotiation(self):
+        self.assertEqual(negotiate("gzip, deflate", ["gzip"]), "gzip")
+        self.assertEqual(negotiate("gzip, br", ["gzip", "br"]), "gzip")
+        if "br" in CODECS:
+            self.assertEqual(negotiate("gzip;q=0.5, br", ["gzip", "br"]), "br")
+        else:
+            self.assertEqual(negotiate("gzip;q=0.5, br", ["gzip", "br"]), "gzip")
+        self.assertEqual(negotiate("*", ["gzip"]), "gzip")
+        self.assertIsNone(negotiate("gzip;q=0, identity", ["gzip"]))
+        self.assertIsNone(negotiate("", ["gzip"]))
+
+    def test_compresses_json(self):
+        response = self._process(HttpResponse(self.body, content_type="application/json"))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+        self.assertEqual(gzip.decompress(response.content), self.body)
+
+    def test_weakens_etag_of_compressed_response(self):
+        response = HttpResponse(self.body, content_type="application/json", headers={"ETag": '"v1"'})
+        self.assertEqual(self._process(response)["ETag"], 'W/"v1"')
+        response = HttpResponse(self.body, content_type="application/json", headers={"ETag": '"v1"'})
+        self.assertEqual(self._process(response, "")["ETag"], '"v1"')
+
+    def test_prefers_brotli(self):
+        if "br" not in CODECS:
+            self.skipTest("brotli is not installed")
+        response = self._process(HttpResponse(self.body, content_type="application/json"), "gzip, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+
+    def test_skips_small_and_bodiless_responses(self):
+        response = self._process(HttpResponse(b"{}", content_type="application/json"))
+        self.assertFalse(response.has_header("Content-Encoding"))
+        response = self._process(HttpResponse(self.body, status=304, content_type="application/json"))
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_skips_clients_without_support(self):
+        response = self._process(HttpResponse(self.body, content_type="application/json"), "")
+        self.assertEqual(response.content, self.body)
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+    def test_streams_incrementally(self):
+        lines = [b'{"id": %d, "title": "note"}\n' % index for index in range(5000)]
+        response = self._process(StreamingHttpResponse(iter(lines), content_type="application/x-ndjson"))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        chunks = list(response.streaming_content)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(gzip.decompress(b"".join(chunks)), b"".join(lines))
+
+    def test_streams_async_content(self):
+        async def lines():
+            for index in range(100):
+                yield b"line %d\n" % index
+
+        response = self._process(StreamingHttpResponse(lines(), content_type="text/csv"))
+
+        async def read():
+            return b"".join([chunk async for chunk in response.streaming_content])
+
+        self.assertEqual(
+            gzip.decompress(asyncio.run(read())), b"".join(b"line %d\n" % i for i in range(100))
+        )
+
+    def test_skips_event_streams(self):
+        response = self._process(StreamingHttpResponse(iter([b"data: 1\n\n"]), content_type="text/event-stream"))
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+
+class PeriodicJobTest(SimpleTestCase):
+    def test_runs_job_until_stopped(self):
+        calls = threading.Semaphore(0)
+
+        def job():
+            calls.release()
+            raise RuntimeError("A failing run does not stop the thread.")
+
+        with self.assertLogs("turbo_back.periodic", "ERROR"):
+            stop = periodic.start("test-job", 0.01, job)
+            try:
+                self.assertIs(periodic.start("test-job", 0.01, job), stop)
+                self.assertTrue(calls.acquire(timeout=5))
+                self.assertTrue(calls.acquire(timeout=5))
+            finally:
+                periodic.stop("test-job")
+        self.assertTrue(stop.is_set())
+        self.assertIsNone(periodic.start("test-job", None, job))
+
+
+class SlimMiddlewareTest(TestCase):
+    def test_api_requests_skip_sessions(self):
+        response = self.client.get("/api/categories/")
+        self.assertFalse(hasattr(response.wsgi_request, "session"))
+        self.assertFalse(hasattr(response.wsgi_request, "_messages"))
+        self.assertNotIn("Cookie", response.get("Vary", ""))
+
+    def test_api_posts_need_no_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        response = client.post("/api/auth/login/", {"email": "x@test.com", "password": "x"})
+        self.assertNotEqual(response.status_code, 403)
+
+    def test_admin_keeps_the_full_stack(self):
+        response = self.client.get("/admin/login/")
+        self.assertTrue(hasattr(response.wsgi_request, "session"))
+        self.assertIn("csrftoken", response.cookies)
+
+    @override_settings(API_SLIM_MIDDLEWARE=False)
+    def test_can_be_disabled(self):
+        response = self.client.get("/api/categories/")
+        self.assertTrue(hasattr(response.wsgi_request, "session"))
+
+    def test_admin_checks_accept_the_subclasses(self):
+        call_command("check", "admin", stdout=io.StringIO())